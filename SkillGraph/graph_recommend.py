@@ -0,0 +1,121 @@
+import json
+import argparse
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from graph_store import CANDIDATE, JOB, SkillGraph, build_skill_graph
+
+# Probability of jumping back to the candidate at each step
+RESTART = 0.15
+
+# Power iteration stops once no column moves more than this (L1)
+TOLERANCE = 1e-4
+
+# Upper bound on power iterations, i.e. the length of the random walks;
+# the top jobs stop changing well before the scores converge
+MAX_ITERATIONS = 20
+
+# Candidates scored per power iteration, i.e. columns of the score matrix
+BATCH_SIZE = 256
+
+# Jobs recommended per candidate
+K = 10
+
+
+def transition_matrix(graph):
+    """
+    Column-stochastic transition matrix of a walk over the graph with the
+    edge directions ignored, so a walk from a candidate reaches jobs through
+    their skills and, further out, through other candidates and jobs.
+    Nodes without edges get an all-zero column.
+    """
+    adjacency = graph.adjacency()
+    adjacency = (adjacency + adjacency.T).tocsr()
+    adjacency.data[:] = 1
+    degrees = np.asarray(adjacency.sum(axis=0)).ravel()
+    inverse = np.divide(1, degrees, out=np.zeros_like(degrees), where=degrees > 0)
+    return (adjacency @ sparse.diags(inverse.astype(np.float32))).astype(np.float32).tocsr()
+
+def personalized_pagerank(transition, sources, restart=RESTART, tol=TOLERANCE, max_iter=MAX_ITERATIONS):
+    """
+    Personalized PageRank of every node for each source node, as an
+    (n_nodes x len(sources)) matrix. All sources are iterated together:
+    each step is one sparse-dense product over all the columns.
+    """
+    teleport = np.zeros((transition.shape[0], len(sources)), dtype=np.float32)
+    teleport[sources, np.arange(len(sources))] = restart
+    scores = teleport / restart
+    for _ in range(max_iter):
+        updated = transition @ scores
+        updated *= 1 - restart
+        updated += teleport
+        change = np.abs(updated - scores).sum(axis=0).max(initial=0)
+        scores = updated
+        if change < tol:
+            break
+    return scores
+
+def top_k(scores, nodes, k=K):
+    """
+    The k best of `nodes` for each column of scores, as (node ids, scores)
+    arrays of shape (n_columns, k), best first. Unreachable nodes score 0.
+    """
+    node_scores = scores[nodes].T
+    k = min(k, len(nodes))
+    best = np.argpartition(-node_scores, k - 1, axis=1)[:, :k] if k else np.empty((len(node_scores), 0), dtype=np.int64)
+    best_scores = np.take_along_axis(node_scores, best, axis=1)
+    order = np.argsort(-best_scores, axis=1, kind='stable')
+    return nodes[np.take_along_axis(best, order, axis=1)], np.take_along_axis(best_scores, order, axis=1)
+
+
+def recommend_jobs(graph, candidates=None, k=K, batch_size=BATCH_SIZE, restart=RESTART, max_iter=MAX_ITERATIONS):
+    """
+    Yield (candidate id, job ids, scores) with the top k jobs of each
+    candidate node (all candidates by default), scored by personalized
+    PageRank. Candidates are processed batch_size at a time, so memory is
+    bounded by n_nodes x batch_size scores.
+    """
+    transition = transition_matrix(graph)
+    jobs = graph.nodes_of_type(JOB)
+    candidates = graph.nodes_of_type(CANDIDATE) if candidates is None else np.asarray(candidates, dtype=np.int64)
+    for start in range(0, len(candidates), batch_size):
+        batch = candidates[start:start + batch_size]
+        scores = personalized_pagerank(transition, batch, restart, max_iter=max_iter)
+        job_ids, job_scores = top_k(scores, jobs, k)
+        for candidate, ids, values in zip(batch, job_ids, job_scores):
+            # Jobs the walk never reached are not recommended
+            reached = values > 0
+            yield candidate, ids[reached], values[reached]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommend jobs to every candidate by personalized PageRank over the skill graph.")
+    parser.add_argument('--store', default=None, help="Graph arrays saved by skillGraphplot.py --store (.npz)")
+    parser.add_argument('--jobs', default='data.json', help="Jobs, used when no --store is given")
+    parser.add_argument('--candidates', default='candidate_skills.json', help="Candidates, used when no --store is given")
+    parser.add_argument('--output', default='candidate_recommendations.jsonl', help="JSON Lines output file")
+    parser.add_argument('-k', type=int, default=K, help="Jobs per candidate")
+    parser.add_argument('--restart', type=float, default=RESTART, help="Restart probability")
+    parser.add_argument('--max-iter', type=int, default=MAX_ITERATIONS, help="Power iterations (walk length)")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Candidates per power iteration")
+    args = parser.parse_args()
+
+    if args.store:
+        graph = SkillGraph.load(args.store)
+    else:
+        graph = build_skill_graph(pd.read_json(args.jobs), pd.read_json(args.candidates))
+
+    count = 0
+    with open(args.output, 'w', encoding='utf-8') as file:
+        for candidate, job_ids, scores in recommend_jobs(graph, None, args.k, args.batch_size, args.restart, args.max_iter):
+            record = {
+                'Candidate': graph.names[candidate],
+                'Jobs': graph.names[job_ids].tolist(),
+                'Scores': [round(float(score), 6) for score in scores],
+            }
+            file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+    print(f"✅ Recommendations for {count} candidates saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
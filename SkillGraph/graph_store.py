@@ -0,0 +1,204 @@
+import datetime
+import numpy as np
+import pandas as pd
+
+# Node types, stored as small integer codes
+NODE_TYPES = ('job', 'skill', 'candidate')
+JOB, SKILL, CANDIDATE = range(len(NODE_TYPES))
+
+# Edges formatted per write by the streaming exporters
+CHUNK_SIZE = 65536
+
+# XML attribute escapes, as written by ElementTree (and so nx.write_gexf)
+ATTRIBUTE_ESCAPES = (('&', '&amp;'), ('<', '&lt;'), ('>', '&gt;'), ('"', '&quot;'), ('\r', '&#13;'), ('\n', '&#10;'), ('\t', '&#09;'))
+
+GEXF_HEADER = """<?xml version='1.0' encoding='utf-8'?>
+<gexf xmlns="http://www.gexf.net/1.2draft" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="http://www.gexf.net/1.2draft http://www.gexf.net/1.2draft/gexf.xsd" version="1.2">
+  <meta lastmodifieddate="{date}">
+    <creator>{creator}</creator>
+  </meta>
+  <graph defaultedgetype="directed" mode="static" name="">
+    <attributes mode="static" class="node">
+      <attribute id="0" title="type" type="string" />
+    </attributes>
+"""
+
+GEXF_NODE = """      <node id="{name}" label="{name}">
+        <attvalues>
+          <attvalue for="0" value="{type}" />
+        </attvalues>
+      </node>
+"""
+
+GEXF_EDGE = '      <edge source="{source}" target="{target}" id="{id}" />\n'
+
+
+def escape_attribute(value):
+    value = str(value)
+    for character, escaped in ATTRIBUTE_ESCAPES:
+        value = value.replace(character, escaped)
+    return value
+
+
+class SkillGraph:
+    """
+    Directed job / skill / candidate graph with integer node ids.
+
+    - names:   node names, in insertion order
+    - types:   node type codes into NODE_TYPES
+    - indptr:  CSR row offsets; the targets of node i are
+    - indices: indices[indptr[i]:indptr[i + 1]], in insertion order
+
+    Edges run skill -> job and candidate -> skill. A few flat arrays replace
+    networkx's per-node dicts, and the exporters stream from them in chunks.
+    """
+
+    def __init__(self, names, types, indptr, indices):
+        self.names = np.asarray(names, dtype=object)
+        self.types = np.asarray(types, dtype=np.int8)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+
+    @classmethod
+    def from_edges(cls, names, types, sources, targets):
+        """Build the CSR adjacency from edges in insertion order; repeated edges keep their first position."""
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        first = ~pd.Series(sources * max(len(names), 1) + targets).duplicated().to_numpy()
+        sources, targets = sources[first], targets[first]
+
+        order = np.argsort(sources, kind='stable')
+        indptr = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(names)), out=indptr[1:])
+        return cls(names, types, indptr, targets[order])
+
+    @classmethod
+    def load(cls, path):
+        arrays = np.load(path)
+        return cls(arrays['names'].astype(object), arrays['types'], arrays['indptr'], arrays['indices'])
+
+    def save(self, path):
+        """Save the arrays as an uncompressed .npz."""
+        np.savez(path, names=self.names.astype(str), types=self.types, indptr=self.indptr, indices=self.indices)
+
+    @property
+    def n_nodes(self):
+        return len(self.names)
+
+    @property
+    def n_edges(self):
+        return len(self.indices)
+
+    def nodes_of_type(self, node_type):
+        return np.flatnonzero(self.types == node_type)
+
+    def successors(self, node):
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def adjacency(self):
+        """The adjacency as a scipy CSR matrix (n_nodes x n_nodes)."""
+        from scipy import sparse
+        return sparse.csr_matrix(
+            (np.ones(self.n_edges, dtype=np.float32), self.indices, self.indptr), shape=(self.n_nodes, self.n_nodes),
+        )
+
+    def edge_chunks(self, chunk_size=CHUNK_SIZE):
+        """Yield (sources, targets) id arrays of up to chunk_size edges, in CSR order."""
+        for start in range(0, self.n_edges, chunk_size):
+            end = min(start + chunk_size, self.n_edges)
+            sources = np.searchsorted(self.indptr, np.arange(start, end), side='right') - 1
+            yield sources, self.indices[start:end]
+
+    def write_gexf(self, path, chunk_size=CHUNK_SIZE, creator='SkillGraph'):
+        """
+        Stream the graph as GEXF 1.2, laid out like nx.write_gexf output.
+        Only one chunk of formatted nodes or edges is held in memory.
+        """
+        names = [escape_attribute(name) for name in self.names]
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(GEXF_HEADER.format(date=datetime.date.today().isoformat(), creator=creator))
+            file.write('    <nodes>\n')
+            for start in range(0, self.n_nodes, chunk_size):
+                file.write(''.join(
+                    GEXF_NODE.format(name=names[node], type=NODE_TYPES[self.types[node]])
+                    for node in range(start, min(start + chunk_size, self.n_nodes))
+                ))
+            file.write('    </nodes>\n')
+            file.write('    <edges>\n')
+            edge_id = 0
+            for sources, targets in self.edge_chunks(chunk_size):
+                file.write(''.join(
+                    GEXF_EDGE.format(source=names[source], target=names[target], id=edge_id + i)
+                    for i, (source, target) in enumerate(zip(sources.tolist(), targets.tolist()))
+                ))
+                edge_id += len(sources)
+            file.write('    </edges>\n')
+            file.write('  </graph>\n</gexf>')
+
+    def write_edge_list(self, path, chunk_size=CHUNK_SIZE):
+        """Stream the edges as a source,target CSV of node names."""
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            file.write('source,target\n')
+            for sources, targets in self.edge_chunks(chunk_size):
+                pd.DataFrame({'source': self.names[sources], 'target': self.names[targets]}).to_csv(
+                    file, header=False, index=False,
+                )
+
+
+def explode_skills(lists):
+    """
+    Explode a Series of skill lists into (rows, positions, skills): row
+    position, position within the row and stripped, lowercased skill,
+    in row order. Each distinct skill string is normalized once.
+    """
+    exploded = pd.Series(lists, dtype=object).reset_index(drop=True).explode()
+    exploded = exploded[exploded.map(lambda skill: isinstance(skill, str))]
+    rows = exploded.index.to_numpy(dtype=np.int64)
+    positions = exploded.groupby(level=0).cumcount().to_numpy(dtype=np.int64)
+
+    codes, uniques = pd.factorize(exploded)
+    normalized = pd.Series(uniques, dtype=object).str.strip().str.lower().to_numpy(dtype=object)
+    return rows, positions, normalized[codes]
+
+def build_skill_graph(jobs_df, candidates_df):
+    """
+    Build the graph of jobs_df ('Title', 'Extracted Skills') and
+    candidates_df ('_id', 'skills[0]') without per-row Python loops.
+
+    Node ids follow the order in which adding the rows one at a time would
+    first see each name; a name added with several types keeps the last.
+    """
+    job_rows, job_positions, job_skills = explode_skills(jobs_df['Extracted Skills'])
+    candidate_rows, candidate_positions, candidate_skills = explode_skills(candidates_df['skills[0]'])
+    n_jobs, n_candidates = len(jobs_df), len(candidates_df)
+
+    # Every node addition as (name, type, order key); each row adds its
+    # job or candidate first, then its skills
+    names = np.concatenate([
+        jobs_df['Title'].to_numpy(dtype=object), job_skills,
+        candidates_df['_id'].to_numpy(dtype=object), candidate_skills,
+    ])
+    types = np.repeat(
+        np.array([JOB, SKILL, CANDIDATE, SKILL], dtype=np.int8),
+        [n_jobs, len(job_skills), n_candidates, len(candidate_skills)],
+    )
+    groups = np.repeat([0, 0, 1, 1], [n_jobs, len(job_skills), n_candidates, len(candidate_skills)])
+    rows = np.concatenate([np.arange(n_jobs), job_rows, np.arange(n_candidates), candidate_rows])
+    positions = np.concatenate([np.zeros(n_jobs, np.int64), job_positions + 1, np.zeros(n_candidates, np.int64), candidate_positions + 1])
+    order = np.lexsort((positions, rows, groups))
+
+    codes = np.empty(len(names), dtype=np.int64)
+    codes[order], unique_names = pd.factorize(pd.Series(names[order], dtype=object))
+    node_types = np.empty(len(unique_names), dtype=np.int8)
+    # The last addition of a name sets its type
+    last = len(order) - 1 - np.unique(codes[order][::-1], return_index=True)[1]
+    node_types[codes[order][last]] = types[order][last]
+
+    # Edges in the order they are added (exploded skills are in row order):
+    # skill -> job, then candidate -> skill
+    job_codes, job_skill_codes, candidate_codes, candidate_skill_codes = np.split(
+        codes, np.cumsum([n_jobs, len(job_skills), n_candidates]),
+    )
+    sources = np.concatenate([job_skill_codes, candidate_codes[candidate_rows]])
+    targets = np.concatenate([job_codes[job_rows], candidate_skill_codes])
+    return SkillGraph.from_edges(unique_names, node_types, sources, targets)
@@ -1,35 +1,32 @@
+import argparse
 import pandas as pd
-import networkx as nx
+from graph_store import build_skill_graph
 
-# Load job data
-job_data_file = 'data.json'  
-jobs_df = pd.read_json(job_data_file)
+def main():
+    parser = argparse.ArgumentParser(description="Build the job / skill / candidate graph and export it.")
+    parser.add_argument('--jobs', default='data.json', help="Jobs with 'Title' and 'Extracted Skills'")
+    parser.add_argument('--candidates', default='candidate_skills.json', help="Candidates with '_id' and 'skills[0]'")
+    parser.add_argument('--output', default='job_skills_candidates_graph.gexf', help="GEXF output file")
+    parser.add_argument('--edge-list', default=None, help="Also write a source,target CSV edge list")
+    parser.add_argument('--store', default=None, help="Also save the compact graph arrays (.npz)")
+    args = parser.parse_args()
 
-# Load candidate data
-candidate_data_file = 'candidate_skills.json' 
-candidates_df = pd.read_json(candidate_data_file)
+    # Load job data
+    jobs_df = pd.read_json(args.jobs)
 
-# Create a directed graph
-G = nx.DiGraph()
+    # Load candidate data
+    candidates_df = pd.read_json(args.candidates)
 
-# Add job nodes and their required skills
-for index, row in jobs_df.iterrows():
-    job_title = row['Title']
-    G.add_node(job_title, type='job')
-    for skill in row['Extracted Skills']:
-        normalized_skill = skill.strip().lower()  # Normalize skill to lowercase
-        G.add_node(normalized_skill, type='skill')
-        G.add_edge(normalized_skill, job_title)
+    # Skills are normalized to stripped lowercase; edges run skill -> job and candidate -> skill
+    graph = build_skill_graph(jobs_df, candidates_df)
+    print(f"{graph.n_nodes} nodes, {graph.n_edges} edges")
 
-# Add candidate nodes and their skills
-for index, row in candidates_df.iterrows():
-    candidate_id = row['_id']
-    G.add_node(candidate_id, type='candidate')  # Add candidate node
-    for skill in row['skills[0]']:  
-        normalized_skill = skill.strip().lower()  # Normalize skill to lowercase
-        G.add_node(normalized_skill, type='skill')  # Ensure no leading/trailing spaces
-        G.add_edge(candidate_id, normalized_skill)  # Connect candidate to their skills
-
-# Export to GEXF
-nx.write_gexf(G, 'job_skills_candidates_graph.gexf')
+    # Export to GEXF
+    graph.write_gexf(args.output)
+    if args.edge_list:
+        graph.write_edge_list(args.edge_list)
+    if args.store:
+        graph.save(args.store)
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import os
+import glob
+import time
+import argparse
+import fitz  # PyMuPDF
+from jobSkillsextractor import iter_job_postings
+from skill_automaton import AhoCorasickMatcher
+from skill_matcher import SKILLS_FILE, SkillMatcher, load_skill_list
+
+
+def load_corpora(job_paths, resume_dir):
+    """Skills texts of the scraped jobs and full texts of the resume PDFs."""
+    jobs = [job["Skills"] for job in iter_job_postings(job_paths) if job["Skills"] != "N/A"]
+    resumes = []
+    for path in sorted(glob.glob(os.path.join(resume_dir, "*.pdf"))):
+        with fitz.open(path) as doc:
+            resumes.append("".join(page.get_text("text") for page in doc))
+    return {"jobs": jobs, "resumes": resumes}
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Speed and agreement of the PhraseMatcher and Aho-Corasick skill matchers.")
+    parser.add_argument("--jobs", nargs="*", default=glob.glob("./scraped_jobs/*.json"), help="Scraped job dumps")
+    parser.add_argument("--resumes", default="./Resumes", help="Directory of resume PDFs")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over each corpus")
+    parser.add_argument("--automaton", default="bench_automaton.pkl")
+    args = parser.parse_args()
+
+    skill_list = load_skill_list(SKILLS_FILE)
+    spacy_matcher, spacy_build = timed(SkillMatcher, skill_list)
+    automaton, automaton_build = timed(AhoCorasickMatcher, skill_list)
+    automaton.save(args.automaton)
+    automaton, automaton_load = timed(AhoCorasickMatcher.load, args.automaton)
+    os.remove(args.automaton)
+
+    print(f"{len(skill_list)} skills")
+    print(f"startup: spacy {spacy_build * 1000:.0f} ms, aho-corasick build {automaton_build * 1000:.1f} ms, load {automaton_load * 1000:.1f} ms")
+    print(f"{'corpus':<8} {'texts':>6} {'MB':>6} {'spacy s':>8} {'a-c s':>8} {'speedup':>8}")
+
+    for name, texts in load_corpora(args.jobs, args.resumes).items():
+        batch = texts * args.repeat
+        expected, spacy_seconds = timed(lambda: list(spacy_matcher.extract_many(batch)))
+        found, automaton_seconds = timed(lambda: list(automaton.extract_many(batch)))
+        # The backends are interchangeable only if every text gives the same skills
+        differing = [(a, b) for a, b in zip(expected, found) if a != b]
+        assert not differing, (f"{name}: {len(differing)} of {len(batch)} texts differ, e.g. "
+                               f"spacy {differing[0][0]} vs aho-corasick {differing[0][1]}")
+        megabytes = sum(map(len, batch)) / 1e6
+        print(f"{name:<8} {len(texts):>6} {megabytes:>6.1f} {spacy_seconds:>8.3f} {automaton_seconds:>8.3f} "
+              f"{spacy_seconds / automaton_seconds:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
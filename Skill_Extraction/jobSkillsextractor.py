@@ -1,92 +1,108 @@
 import json
-import spacy
-from spacy.matcher import PhraseMatcher
+import argparse
 import re
-
-# Load NLP model
-nlp = spacy.load("en_core_web_sm")
-
-# Load predefined skills from extracted_skills.json
-with open("extracted_skills.json", "r", encoding="utf-8") as file:
-    skill_data = json.load(file)
-
-# Extract the list of skills from the JSON file
-skill_list = skill_data.get("skills", [])  # Assuming JSON structure is {"skills": ["Python", "Java", "AWS"]}
-
-# Create PhraseMatcher
-matcher = PhraseMatcher(nlp.vocab)
-patterns = [nlp(skill.lower()) for skill in skill_list]
-matcher.add("SKILLS", patterns)
-
-def extract_skills(text):
-    """Extract predefined skills from text using PhraseMatcher"""
-    if not text:
-        return []
-    
-    doc = nlp(text.lower())  # Convert text to lowercase
-    matches = matcher(doc)
-    
-    # Extract matched skills
-    extracted_skills = set()
-    for match_id, start, end in matches:
-        extracted_skills.add(doc[start:end].text)
-
-    return list(extracted_skills)
+from itertools import tee
+from skill_matcher import BATCH_SIZE, SKILLS_FILE, SkillMatcher, load_skill_list
+
+# Skill matcher backends selectable with --matcher
+MATCHERS = ("spacy", "aho-corasick")
+
+# Line of dashes separating job postings in the scraped dumps
+JOB_DELIMITER = "--------------------------------------------------"
+
+# Fields read from each job posting, all matched in one regex pass
+JOB_FIELDS = ("Title", "Company", "Experience", "Skills")
+FIELD_PATTERN = re.compile(r"(Title|Company|Experience|Skills):\s*(.*)")
+
+def iter_job_blocks(lines):
+    """
+    Yield the text of each job posting from an iterable of lines.
+    Only the current block is held in memory; text before the first
+    delimiter (such as "Page N: Retrieved ..." lines) belongs to the first
+    block, as when splitting the whole file on the delimiter.
+    """
+    block = []
+    for line in lines:
+        if JOB_DELIMITER not in line:
+            block.append(line)
+            continue
+        # A delimiter may share its line with text on either side
+        parts = line.split(JOB_DELIMITER)
+        block.append(parts[0])
+        yield ''.join(block)
+        for part in parts[1:-1]:
+            yield part
+        block = [parts[-1]]
+    yield ''.join(block)
+
+def parse_job_block(block):
+    """
+    Extract the job fields from one block, or None if it has none (e.g.
+    the dashes left over after the last posting).
+    The first occurrence of each field wins, like a separate re.search per field.
+    """
+    job_info = dict.fromkeys(JOB_FIELDS, "N/A")
+    found = set()
+    for match in FIELD_PATTERN.finditer(block):
+        field = match.group(1)
+        if field not in found:
+            found.add(field)
+            job_info[field] = match.group(2)
+    return job_info if found else None
 
 def parse_job_postings(file_path):
-    """Parse the plain text job postings file into a structured format"""
+    """Stream structured job postings from a scraped plain text dump."""
     with open(file_path, "r", encoding="utf-8") as file:
-        content = file.read()
-
-    job_blocks = content.split("--------------------------------------------------")
-    job_data = []
-
-    for job in job_blocks:
-        job = job.strip()
-        if not job:
-            continue  # Skip empty blocks
-
-        job_info = {}
-        
-        # Extract fields using regex
-        job_info["Title"] = re.search(r"Title:\s*(.*)", job).group(1) if re.search(r"Title:\s*(.*)", job) else "N/A"
-        job_info["Company"] = re.search(r"Company:\s*(.*)", job).group(1) if re.search(r"Company:\s*(.*)", job) else "N/A"
-        job_info["Experience"] = re.search(r"Experience:\s*(.*)", job).group(1) if re.search(r"Experience:\s*(.*)", job) else "N/A"
-        job_info["Skills"] = re.search(r"Skills:\s*(.*)", job).group(1) if re.search(r"Skills:\s*(.*)", job) else "N/A"
-        
-        job_data.append(job_info)
-
-    return job_data
-
-def process_job_postings(file_path):
-    """Extract and save skills from parsed job postings"""
-    job_postings = parse_job_postings(file_path)
-    extracted_data = []
-
-    for job in job_postings:
-        title = job["Title"]
-        company = job["Company"]
-        experience = job["Experience"]
-        skills = job["Skills"]
-
-        extracted_skills = []
-
-        # If skills are available, use them
-        if skills and skills != "N/A":
-            extracted_skills = extract_skills(skills)
-
-        extracted_data.append({
-            "Title": title,
-            "Company": company,
-            "Experience": experience,
-            "Extracted Skills": extracted_skills
-        })
-
-    # Save extracted skills back to JSON
-    with open("updated_extracted_skills.json", "w", encoding="utf-8") as file:
-        json.dump(extracted_data, file, indent=4)
-
-    print("✅ Extracted skills saved to updated_extracted_skills.json")
+        for block in iter_job_blocks(file):
+            job_info = parse_job_block(block.strip())
+            if job_info is not None:
+                yield job_info
+
+def iter_job_postings(file_paths):
+    for file_path in file_paths:
+        yield from parse_job_postings(file_path)
+
+def process_job_postings(file_paths, output_path="updated_extracted_skills.jsonl", matcher=None,
+                         n_process=1, batch_size=BATCH_SIZE):
+    """
+    Extract skills from parsed job postings and write one JSON record per
+    line. Skills texts are matched in batches while the postings are still
+    being read, so memory stays bounded by the batch size.
+    """
+    matcher = matcher or SkillMatcher(load_skill_list(SKILLS_FILE))
+    jobs, records = tee(iter_job_postings(file_paths))
+
+    # If skills are available, use them
+    texts = (job["Skills"] if job["Skills"] != "N/A" else "" for job in jobs)
+
+    count = 0
+    with open(output_path, "w", encoding="utf-8") as output:
+        for job, extracted_skills in zip(records, matcher.extract_many(texts, n_process, batch_size)):
+            output.write(json.dumps({
+                "Title": job["Title"],
+                "Company": job["Company"],
+                "Experience": job["Experience"],
+                "Extracted Skills": extracted_skills
+            }) + "\n")
+            count += 1
+
+    print(f"✅ Extracted skills for {count} jobs saved to {output_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract skills from scraped job postings.")
+    parser.add_argument("inputs", nargs="*", default=["./scraped_jobs/foundit.json"], help="Scraped job dumps")
+    parser.add_argument("--output", default="updated_extracted_skills.jsonl", help="JSON Lines output file")
+    parser.add_argument("--matcher", choices=MATCHERS, default="spacy", help="Skill matcher backend")
+    parser.add_argument("--n-process", type=int, default=1, help="Matcher processes")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Texts per batch")
+    args = parser.parse_args()
+
+    matcher = None
+    if args.matcher == "aho-corasick":
+        from skill_automaton import AhoCorasickMatcher
+        matcher = AhoCorasickMatcher.from_file(SKILLS_FILE)
+    process_job_postings(args.inputs, args.output, matcher, args.n_process, args.batch_size)
 
 # Process the job postings from the plain text file
-process_job_postings("./scraped_jobs/foundit.json")
+if __name__ == "__main__":
+    main()
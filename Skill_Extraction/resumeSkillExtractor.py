@@ -1,42 +1,191 @@
-import fitz  # PyMuPDF
+import os
 import json
-import spacy
-from spacy.matcher import PhraseMatcher
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import fitz  # PyMuPDF
+from resume_cache import CACHE_FILE, MAX_CACHE_BYTES, ResumeCache
+from skill_matcher import SKILLS_FILE, SkillMatcher, load_skill_list, skills_digest
+
+# Skill matcher backends selectable with --matcher
+MATCHERS = ("spacy", "aho-corasick")
+
+# Matcher of each worker process
+matcher = None
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def list_resumes(inputs):
+    """PDF files given directly or found in the given directories, sorted."""
+    paths = []
+    for path in inputs:
+        if os.path.isdir(path):
+            paths.extend(os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith(".pdf"))
+        else:
+            paths.append(path)
+    return sorted(paths)
+
+def processed_digests(output_path, skills_version):
+    """
+    Content hashes of the resumes already in the output file with skills
+    from the current matcher and skill list. Records from another matcher
+    or an older skill list are dropped from the file, so they are matched
+    again.
+    """
+    current, stale = [], 0
+    if not os.path.exists(output_path):
+        return set()
+    with open(output_path, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A line cut short by an interrupted run
+                continue
+            if record.get("Skills Version") == skills_version:
+                current.append(line)
+            else:
+                stale += 1
+
+    if stale:
+        temp_path = output_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.writelines(current)
+        os.replace(temp_path, output_path)
+    return {json.loads(line)["SHA256"] for line in current}
+
 
 def extract_text_from_pdf(pdf_path):
     """Extract text from a given PDF resume."""
-    text = ""
     with fitz.open(pdf_path) as doc:
-        for page in doc:
-            text += page.get_text("text") + "\n"
-    return text
+        return "".join(page.get_text("text") + "\n" for page in doc)
+
+def load_matcher(backend="spacy"):
+    if backend == "aho-corasick":
+        from skill_automaton import AhoCorasickMatcher
+        return AhoCorasickMatcher.from_file(SKILLS_FILE)
+    # Tokenizer-only matcher; no tagger, parser or NER is run
+    return SkillMatcher(load_skill_list(SKILLS_FILE))
 
+def matcher_version():
+    """
+    Version of the matched skills. Both backends find exactly the same
+    skills, so only the skill list matters and switching backends keeps
+    the cached skills.
+    """
+    return skills_digest(load_skill_list(SKILLS_FILE))
 
-resume_text = extract_text_from_pdf("./Resumes/1729256225501-Madhuri Gajanan Gadekar.pdf")
-print(resume_text)
+def init_worker(backend):
+    global matcher
+    matcher = load_matcher(backend)
 
+def extract_skills_from_text(text):
+    """Extract skills from resume text using the worker's matcher."""
+    return matcher.extract(text)
 
-with open("extracted_skills.json", "r") as file:
-    skill_list = json.load(file)  # Example: ["Python", "Machine Learning", "SEO", "Social Media Marketing"]
+def process_resume(pdf_path, text=None):
+    """
+    Match the skills of one resume, parsing the PDF unless its text is
+    given (from the cache). Runs in a worker process; returns (text, skills).
+    """
+    if text is None:
+        text = extract_text_from_pdf(pdf_path)
+    return text, extract_skills_from_text(text)
 
+def resume_record(pdf_path, digest, text, skills, skills_version):
+    return {
+        "File": os.path.basename(pdf_path),
+        "SHA256": digest,
+        "Characters": len(text),
+        "Skills Version": skills_version,
+        "Extracted Skills": skills,
+    }
 
-nlp = spacy.load("en_core_web_sm")  
-matcher = PhraseMatcher(nlp.vocab)
 
+def ingest_resumes(inputs, output_path="resume_skills.jsonl", backend="spacy", workers=None,
+                   cache_path=CACHE_FILE, max_cache_bytes=MAX_CACHE_BYTES):
+    """
+    Extract the skills of every resume PDF with a process pool, appending
+    one JSON record per resume as soon as it is done. Resumes whose content
+    hash is already in the output are skipped, so an interrupted or repeated
+    run only processes new uploads.
 
-patterns = [nlp(skill.lower()) for skill in skill_list]
-matcher.add("SKILLS", patterns)
+    Texts and skills are cached by content hash. After a skill-list
+    change the cached texts are only matched again, without opening the
+    PDFs.
+    """
+    skills_version = matcher_version()
+    done = processed_digests(output_path, skills_version)
 
-def extract_skills_from_text(text):
-    """Extract skills from resume text using PhraseMatcher."""
-    extracted_skills = set()
-    doc = nlp(text.lower())
+    with ResumeCache(cache_path) as cache, open(output_path, "a", encoding="utf-8") as output:
+        def write(pdf_path, digest, text, skills):
+            output.write(json.dumps(resume_record(pdf_path, digest, text, skills, skills_version), ensure_ascii=False) + "\n")
+            output.flush()
+
+        pending = {}
+        for pdf_path in list_resumes(inputs):
+            digest = cache.file_digest(pdf_path, file_digest)
+            if digest not in done:
+                # Identical uploads under different names are processed once
+                pending.setdefault(digest, pdf_path)
+        print(f"📄 {len(pending)} resumes to process, {len(done)} already processed")
+
+        # Cached with the current matcher and skill list: nothing left to do
+        texts = {}
+        count = failed = 0
+        for digest, pdf_path in list(pending.items()):
+            cached = cache.get(digest)
+            if cached is None:
+                continue
+            text, skills, version = cached
+            if version == skills_version:
+                write(pdf_path, digest, text, skills)
+                del pending[digest]
+                count += 1
+            else:
+                texts[digest] = text
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(backend,)) as executor:
+                futures = {
+                    executor.submit(process_resume, pdf_path, texts.get(digest)): (digest, pdf_path)
+                    for digest, pdf_path in pending.items()
+                }
+                for future in as_completed(futures):
+                    digest, pdf_path = futures[future]
+                    try:
+                        text, skills = future.result()
+                    except Exception as e:
+                        # Left out of the output, so the next run retries it
+                        print(f"⚠️ Failed to process {pdf_path}: {e}")
+                        failed += 1
+                        continue
+                    cache.put(digest, text, skills, skills_version)
+                    write(pdf_path, digest, text, skills)
+                    count += 1
+
+        evicted = cache.evict(max_cache_bytes)
 
-    matches = matcher(doc)  # Find skill matches
-    for match_id, start, end in matches:
-        extracted_skills.add(doc[start:end].text)
+    print(f"✅ Extracted skills for {count} resumes saved to {output_path} "
+          f"({len(texts)} re-matched from cache, {failed} failed, {evicted} evicted from cache)")
 
-    return list(extracted_skills)
+def main():
+    parser = argparse.ArgumentParser(description="Extract skills from resume PDFs in parallel.")
+    parser.add_argument("inputs", nargs="*", default=["./Resumes"], help="Resume PDFs or directories of them")
+    parser.add_argument("--output", default="resume_skills.jsonl", help="JSON Lines output file, appended to")
+    parser.add_argument("--matcher", choices=MATCHERS, default="spacy", help="Skill matcher backend")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--cache", default=CACHE_FILE, help="SQLite cache of resume texts and skills")
+    parser.add_argument("--cache-size-mb", type=float, default=MAX_CACHE_BYTES / 2**20, help="Cache size kept after eviction")
+    args = parser.parse_args()
+    ingest_resumes(args.inputs, args.output, args.matcher, args.workers, args.cache, int(args.cache_size_mb * 2**20))
 
-skills = extract_skills_from_text(resume_text)
-print("Extracted Skills:", skills)
+if __name__ == "__main__":
+    main()
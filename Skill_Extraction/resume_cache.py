@@ -0,0 +1,106 @@
+import os
+import json
+import time
+import sqlite3
+
+# SQLite file holding extracted resume texts and matched skills
+CACHE_FILE = "resume_cache.sqlite"
+
+# Size of cached texts and skills kept after eviction
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    sha256 TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    skills TEXT NOT NULL,
+    skills_version TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resumes_last_used ON resumes (last_used);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    file_size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+"""
+
+
+class ResumeCache:
+    """
+    On-disk cache of resume PDFs, keyed by content hash.
+
+    - resumes: extracted text and matched skills per SHA-256, tagged with
+      the matcher and skill-list version the skills were matched with
+    - files:   SHA-256 of each path as of its size and modification time,
+      so unchanged files are not even read to be hashed
+
+    Uploaded resumes never change, so the text is valid forever; only the
+    skills go stale when the matcher or skill list changes, and they are
+    re-matched from the cached text. Only the ingesting process writes to
+    the cache.
+    """
+
+    def __init__(self, path=CACHE_FILE):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def file_digest(self, path, digest_function):
+        """SHA-256 of a file, hashed with digest_function only if it changed since last seen."""
+        stat = os.stat(path)
+        row = self.connection.execute(
+            "SELECT sha256 FROM files WHERE path = ? AND file_size = ? AND mtime_ns = ?",
+            (path, stat.st_size, stat.st_mtime_ns),
+        ).fetchone()
+        if row:
+            return row[0]
+        digest = digest_function(path)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (path, stat.st_size, stat.st_mtime_ns, digest),
+        )
+        return digest
+
+    def get(self, digest):
+        """(text, skills, skills_version) of a resume, or None if it is not cached."""
+        row = self.connection.execute(
+            "SELECT text, skills, skills_version FROM resumes WHERE sha256 = ?", (digest,),
+        ).fetchone()
+        if row is None:
+            return None
+        self.connection.execute("UPDATE resumes SET last_used = ? WHERE sha256 = ?", (time.time(), digest))
+        return row[0], json.loads(row[1]), row[2]
+
+    def put(self, digest, text, skills, skills_version):
+        skills = json.dumps(skills, ensure_ascii=False)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO resumes VALUES (?, ?, ?, ?, ?, ?)",
+            (digest, text, skills, skills_version, len(text.encode("utf-8")) + len(skills), time.time()),
+        )
+        # Committed per resume, so an interrupted run keeps its work
+        self.connection.commit()
+
+    def evict(self, max_bytes=MAX_CACHE_BYTES):
+        """Drop the least recently used resumes until the cache fits in max_bytes. Returns the number dropped."""
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM resumes").fetchone()[0]
+        evicted = []
+        for digest, size in self.connection.execute("SELECT sha256, size FROM resumes ORDER BY last_used"):
+            if total <= max_bytes:
+                break
+            evicted.append((digest,))
+            total -= size
+        self.connection.executemany("DELETE FROM resumes WHERE sha256 = ?", evicted)
+        self.connection.executemany("DELETE FROM files WHERE sha256 = ?", evicted)
+        self.connection.commit()
+        return len(evicted)
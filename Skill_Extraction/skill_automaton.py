@@ -0,0 +1,108 @@
+import os
+import pickle
+from multiprocessing import Pool
+import numpy as np
+import ahocorasick
+from spacy.attrs import ORTH
+from skill_matcher import BATCH_SIZE, MODEL_NAME, SKILLS_FILE, load_skill_list, load_tokenizer, normalize_skill, skills_digest
+
+# Compiled automaton, rebuilt whenever the skill list changes
+AUTOMATON_FILE = "skill_automaton.pkl"
+
+# Matcher of each worker process
+worker_matcher = None
+
+
+class AhoCorasickMatcher:
+    """
+    Finds known skills in texts with an Aho–Corasick automaton over the
+    tokens of the lowercased text. Texts and skills are split by the same
+    spaCy tokenizer as SkillMatcher, and the automaton compares the same
+    token texts as its PhraseMatcher, so both find exactly the same skills;
+    the automaton only replaces the matching, in one pass per text.
+
+    The letters of the automaton are the ranks of the skill tokens' hashes
+    (from 1; 0 stands for any other token), found for a whole doc at once
+    with np.searchsorted. The compiled automaton is pickled so workers load
+    it instantly; only the tokenizer is loaded again.
+    """
+
+    def __init__(self, skill_list, model_name=MODEL_NAME):
+        self.digest = skills_digest(skill_list)
+        self.model_name = model_name
+        self.tokenizer = load_tokenizer(model_name).tokenizer
+        patterns = [self.tokenizer(key).to_array(ORTH) for key in map(normalize_skill, skill_list) if key]
+        self.orths = np.unique(np.concatenate(patterns)) if patterns else np.empty(0, dtype=np.uint64)
+        self.automaton = ahocorasick.Automaton(ahocorasick.STORE_LENGTH, ahocorasick.KEY_SEQUENCE)
+        for orths in patterns:
+            self.automaton.add_word(tuple(self.letters(orths).tolist()))
+        self.automaton.make_automaton()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["tokenizer"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.tokenizer = load_tokenizer(self.model_name).tokenizer
+
+    def save(self, path=AUTOMATON_FILE):
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path=AUTOMATON_FILE):
+        with open(path, "rb") as file:
+            return pickle.load(file)
+
+    @classmethod
+    def from_file(cls, skills_path=SKILLS_FILE, automaton_path=AUTOMATON_FILE, model_name=MODEL_NAME):
+        """Load the compiled automaton, rebuilding it if the skill list or tokenizer model has changed."""
+        skill_list = load_skill_list(skills_path)
+        if os.path.exists(automaton_path):
+            matcher = cls.load(automaton_path)
+            if matcher.digest == skills_digest(skill_list) and matcher.model_name == model_name:
+                return matcher
+        matcher = cls(skill_list, model_name)
+        matcher.save(automaton_path)
+        return matcher
+
+    def letters(self, orths):
+        """Automaton letters of an array of token hashes."""
+        ranks = np.searchsorted(self.orths, orths)
+        known = self.orths[np.minimum(ranks, len(self.orths) - 1)] == orths
+        return np.where(known, ranks + 1, 0)
+
+    def match(self, doc):
+        """Matched skills of a doc, in order of first appearance, like SkillMatcher.match."""
+        if not len(doc) or not len(self.orths):
+            return []
+        hits = self.automaton.iter(tuple(self.letters(doc.to_array(ORTH)).tolist()))
+        spans = sorted((end + 1 - length, end + 1) for end, length in hits)
+        return list(dict.fromkeys(doc[start:end].text for start, end in spans))
+
+    def extract(self, text):
+        """Extract skills from one text."""
+        if not text:
+            return []
+        return self.match(self.tokenizer(text.lower()))
+
+    def extract_many(self, texts, n_process=1, batch_size=BATCH_SIZE):
+        """Yield the skills of each text, in order, over `n_process` worker processes."""
+        if n_process == 1:
+            for doc in self.tokenizer.pipe((text.lower() if text else "" for text in texts), batch_size=batch_size):
+                yield self.match(doc)
+            return
+        with Pool(n_process, initializer=init_worker, initargs=(self,)) as pool:
+            yield from pool.imap(worker_extract, texts, chunksize=batch_size)
+
+
+def init_worker(matcher):
+    global worker_matcher
+    worker_matcher = matcher
+
+def worker_extract(text):
+    return worker_matcher.extract(text)
@@ -0,0 +1,71 @@
+import json
+import hashlib
+import spacy
+from spacy.matcher import PhraseMatcher
+
+# spaCy model whose tokenizer is used for matching
+MODEL_NAME = "en_core_web_sm"
+
+# PhraseMatcher compares token text only, so every trained component is skipped
+EXCLUDED_COMPONENTS = ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer", "ner"]
+
+# Texts per nlp.pipe batch
+BATCH_SIZE = 256
+
+# Predefined skills, as {"skills": [...]} or a plain list
+SKILLS_FILE = "extracted_skills.json"
+
+
+def load_skill_list(path=SKILLS_FILE):
+    with open(path, "r", encoding="utf-8") as file:
+        skill_data = json.load(file)
+    if isinstance(skill_data, dict):
+        return skill_data.get("skills", [])
+    return skill_data
+
+def skills_digest(skill_list):
+    """Version of a skill list; results matched with another version are stale."""
+    return hashlib.sha256("\n".join(skill_list).encode("utf-8")).hexdigest()
+
+def normalize_skill(skill):
+    """Pattern text of a skill; stray spaces in the skill list would otherwise become tokens."""
+    return skill.strip().lower()
+
+def load_tokenizer(model_name=MODEL_NAME):
+    """Load only the tokenizer of a spaCy model (its English rules if the model is not installed)."""
+    try:
+        return spacy.load(model_name, exclude=EXCLUDED_COMPONENTS)
+    except OSError:
+        print(f"⚠️ spaCy model '{model_name}' not found, using the blank English tokenizer")
+        return spacy.blank("en")
+
+
+class SkillMatcher:
+    """
+    Finds known skills in texts with a PhraseMatcher over lowercased tokens.
+    Texts are tokenized in batches with nlp.pipe, optionally in several
+    processes, without running any trained pipeline component.
+    """
+
+    def __init__(self, skill_list, model_name=MODEL_NAME):
+        self.nlp = load_tokenizer(model_name)
+        self.matcher = PhraseMatcher(self.nlp.vocab)
+        # Patterns only need tokens, so make_doc replaces the full pipeline
+        patterns = [normalize_skill(skill) for skill in skill_list]
+        self.matcher.add("SKILLS", [self.nlp.make_doc(pattern) for pattern in patterns if pattern])
+
+    def match(self, doc):
+        """Matched skills of a doc, in order of first appearance."""
+        return list(dict.fromkeys(doc[start:end].text for _, start, end in self.matcher(doc)))
+
+    def extract(self, text):
+        """Extract skills from one text."""
+        if not text:
+            return []
+        return self.match(self.nlp.make_doc(text.lower()))
+
+    def extract_many(self, texts, n_process=1, batch_size=BATCH_SIZE):
+        """Yield the skills of each text, in order, tokenizing with nlp.pipe."""
+        docs = self.nlp.pipe((text.lower() if text else "" for text in texts), n_process=n_process, batch_size=batch_size)
+        for doc in docs:
+            yield self.match(doc)
@@ -0,0 +1,120 @@
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.preprocessing import normalize
+
+# Number of candidates scored against all jobs per block. Each block holds a
+# dense (block_size x n_jobs) float64 score matrix.
+BLOCK_SIZE = 1024
+
+
+def binary_skill_matrix(skill_lists, vocabulary):
+    """Build a CSR 0/1 matrix with one row per skill list over `vocabulary`."""
+    indptr = [0]
+    indices = []
+    for skills in skill_lists:
+        cols = {vocabulary[skill] for skill in skills}
+        indices.extend(sorted(cols))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float64)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(skill_lists), len(vocabulary)))
+
+
+def build_matrices(candidates_skills, jobs_skills):
+    """
+    Vectorize candidates and jobs once.
+
+    Returns the binary skill-set matrices used for Jaccard and the
+    L2-normalized word count matrices used for cosine similarity.
+    """
+    vocabulary = {}
+    for skills in candidates_skills + jobs_skills:
+        for skill in skills:
+            vocabulary.setdefault(skill, len(vocabulary))
+
+    candidates_sets = binary_skill_matrix(candidates_skills, vocabulary)
+    jobs_sets = binary_skill_matrix(jobs_skills, vocabulary)
+
+    # Same word-level vectorizer the per-pair recommender used
+    all_skills_text = [' '.join(skills) for skills in (candidates_skills + jobs_skills)]
+    vectorizer = CountVectorizer().fit(all_skills_text)
+    candidates_vectors = vectorizer.transform([' '.join(skills) for skills in candidates_skills])
+    jobs_vectors = vectorizer.transform([' '.join(skills) for skills in jobs_skills])
+
+    # cosine(a, b) == normalize(a) . normalize(b); all-zero rows stay zero
+    candidates_vectors = normalize(candidates_vectors.astype(np.float64), norm='l2')
+    jobs_vectors = normalize(jobs_vectors.astype(np.float64), norm='l2')
+
+    return candidates_sets, jobs_sets, candidates_vectors, jobs_vectors
+
+
+def score_block(candidates_sets, jobs_sets, candidates_vectors, jobs_vectors):
+    """
+    Score a block of candidates against all jobs.
+
+    intersection = A . B^T on the binary matrices, union = |a| + |b| - intersection.
+    Returns the dense (n_candidates x n_jobs) matrix of (jaccard + cosine) / 2.
+    """
+    intersection = (candidates_sets @ jobs_sets.T).toarray()
+    candidate_sizes = np.asarray(candidates_sets.sum(axis=1)).reshape(-1, 1)
+    job_sizes = np.asarray(jobs_sets.sum(axis=1)).reshape(1, -1)
+    union = candidate_sizes + job_sizes - intersection
+
+    jaccard = np.divide(intersection, union, out=np.zeros_like(intersection), where=union != 0)
+    cosine = (candidates_vectors @ jobs_vectors.T).toarray()
+    return (jaccard + cosine) / 2
+
+
+def top_k(scores, k):
+    """
+    Return the indices of the k largest scores per row, best first.
+
+    Ties are broken by the lower column index, matching heapq.nlargest over
+    (job_idx, score) pairs in job order.
+    """
+    n_rows, n_cols = scores.shape
+    k = min(k, n_cols)
+    if k == 0:
+        return np.empty((n_rows, 0), dtype=np.int64)
+
+    # Smallest score that still makes the top k, per row
+    partitioned = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    kth = np.take_along_axis(scores, partitioned, axis=1).min(axis=1)
+
+    result = np.empty((n_rows, k), dtype=np.int64)
+    for row in range(n_rows):
+        row_scores = scores[row]
+        above = np.flatnonzero(row_scores > kth[row])
+        ties = np.flatnonzero(row_scores == kth[row])[:k - len(above)]
+        chosen = np.concatenate([above, ties])
+        # Sort by descending score, then ascending job index
+        order = np.lexsort((chosen, -row_scores[chosen]))
+        result[row] = chosen[order]
+    return result
+
+
+def recommend(candidates_skills, jobs_skills, k=10, block_size=BLOCK_SIZE):
+    """
+    Compute the top-k jobs for every candidate.
+
+    Returns (indices, scores): two (n_candidates x k) arrays holding job
+    positions and their average Jaccard/cosine scores.
+    """
+    candidates_sets, jobs_sets, candidates_vectors, jobs_vectors = build_matrices(candidates_skills, jobs_skills)
+
+    n_candidates = candidates_sets.shape[0]
+    k = min(k, jobs_sets.shape[0])
+    indices = np.empty((n_candidates, k), dtype=np.int64)
+    scores = np.empty((n_candidates, k), dtype=np.float64)
+
+    for start in range(0, n_candidates, block_size):
+        stop = min(start + block_size, n_candidates)
+        block_scores = score_block(
+            candidates_sets[start:stop], jobs_sets,
+            candidates_vectors[start:stop], jobs_vectors,
+        )
+        block_top = top_k(block_scores, k)
+        indices[start:stop] = block_top
+        scores[start:stop] = np.take_along_axis(block_scores, block_top, axis=1)
+
+    return indices, scores
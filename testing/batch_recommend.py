@@ -0,0 +1,42 @@
+import time
+import argparse
+import pandas as pd
+from category_index import CategoryCache, INCREMENTAL_INDEX_DIR, INDEX_DIR, MEMORY_BUDGET, recommend_batch
+from skill_store import STORE_DIR
+
+# Candidates exported by Skill_Extraction/skillextractor.py
+CANDIDATES_FILE = '../recommendation/candidate_skills.json'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score all candidates against category indexes in one batched pass.")
+    parser.add_argument('--candidates', default=CANDIDATES_FILE)
+    parser.add_argument('--category', action='append', help="Category to search (repeatable); defaults to all")
+    parser.add_argument('-k', type=int, default=5, help="Recommendations per candidate and category")
+    parser.add_argument('--output', default='batch_recommendations.csv', help="CSV or .parquet output file")
+    parser.add_argument('--store-dir', default=STORE_DIR)
+    parser.add_argument('--index-dir', default=INDEX_DIR)
+    parser.add_argument('--incremental-dir', default=INCREMENTAL_INDEX_DIR,
+                        help="Incremental indexes, preferred over --index-dir for the categories they cover")
+    parser.add_argument('--memory-budget-mb', type=int, default=MEMORY_BUDGET // 1024 ** 2)
+    args = parser.parse_args()
+
+    candidates_df = pd.read_json(args.candidates)
+    candidate_skills = candidates_df['skills[0]'].apply(lambda x: x if isinstance(x, list) else []).tolist()
+
+    cache = CategoryCache(args.store_dir, args.index_dir, args.memory_budget_mb * 1024 ** 2, args.incremental_dir)
+    categories = args.category or cache.store.categories
+
+    start = time.perf_counter()
+    results = recommend_batch(cache, categories, candidate_skills, candidates_df['_id'].to_numpy(), k=args.k)
+    print(f"✅ Scored {len(candidate_skills)} candidates against {len(categories)} categories "
+          f"in {time.perf_counter() - start:.2f}s ({len(results)} recommendations)")
+
+    if args.output.endswith('.parquet'):
+        results.to_parquet(args.output, index=False)
+    else:
+        results.to_csv(args.output, index=False)
+    print(f"✅ Recommendations saved to '{args.output}'")
+
+if __name__ == "__main__":
+    main()
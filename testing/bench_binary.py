@@ -0,0 +1,77 @@
+import time
+import argparse
+import numpy as np
+import pandas as pd
+import faiss
+from binary_skills import BinarySkillIndex, intersections, pack_rows, popcount, set_scores
+from skill_store import SkillStore, preprocess_text
+from graphCreator2 import M, EF_CONSTRUCTION
+
+# Candidates used as benchmark queries
+CANDIDATES_FILE = '../recommendation/candidate_skills.json'
+
+
+def float_index(matrix):
+    """The float32 HNSW layout built by graphCreator2.py --layout float."""
+    vectors = matrix.toarray()
+    faiss.normalize_L2(vectors)
+    index = faiss.IndexHNSWFlat(vectors.shape[1], M)
+    index.hnsw.efConstruction = EF_CONSTRUCTION
+    index.add(vectors)
+    return index
+
+def queries_per_second(search, n_queries, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        search()
+    return n_queries * repeats / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory and QPS of packed binary codes versus the float32 HNSW index.")
+    parser.add_argument('--categories', type=int, default=5, help="Number of largest categories to benchmark")
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    candidates = pd.read_json(CANDIDATES_FILE)['skills[0]']
+    skill_lists = [
+        sorted({preprocess_text(skill) for skill in skills} - {''})
+        for skills in candidates if isinstance(skills, list)
+    ]
+
+    store = SkillStore()
+    sizes = {name: entry['rows'] for name, entry in store.manifest['categories'].items()}
+    for category_name in sorted(sizes, key=sizes.get, reverse=True)[:args.categories]:
+        skills = store.load_category(category_name)
+        rows = np.flatnonzero(np.diff(skills.matrix.indptr) > 0)
+        matrix = skills.matrix[rows]
+
+        queries = skills.transform(skill_lists)
+        queries = queries[queries.any(axis=1)]
+        if not len(queries):
+            continue
+        packed = pack_rows(queries)
+        normalized = queries.copy()
+        faiss.normalize_L2(normalized)
+
+        binary = BinarySkillIndex.from_matrix(matrix)
+        hnsw = float_index(matrix)
+        float_bytes = faiss.serialize_index(hnsw).nbytes
+
+        binary_qps = queries_per_second(lambda: binary.search(packed, args.k), len(queries), args.repeats)
+        float_qps = queries_per_second(lambda: hnsw.search(normalized, args.k), len(queries), args.repeats)
+
+        # Recall of the approximate float index against exact set cosine
+        exact = set_scores(intersections(packed, binary.word_codes), popcount(packed), binary.sizes)
+        kth = np.sort(exact, axis=1)[:, -args.k:][:, :1]
+        _, ids = hnsw.search(normalized, args.k)
+        hnsw_scores = np.where(ids >= 0, np.take_along_axis(exact, np.maximum(ids, 0), axis=1), -np.inf)
+        recall = np.mean(np.sum(hnsw_scores >= kth - 1e-6, axis=1) / ids.shape[1])
+
+        print(f"\n📌 {category_name}: {matrix.shape[0]} jobs x {matrix.shape[1]} skills, {len(queries)} queries")
+        print(f"  binary  {binary.nbytes / 1e6:8.2f} MB  {binary_qps:10.0f} QPS  recall@{args.k} 1.000 (exact)")
+        print(f"  float   {float_bytes / 1e6:8.2f} MB  {float_qps:10.0f} QPS  recall@{args.k} {recall:.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from category_index import CategoryCache, INDEX_DIR as CATEGORY_INDEX_DIR, has_index, search_categories
+from global_index import GlobalIndex, INDEX_DIR as GLOBAL_INDEX_DIR
+from skill_store import preprocess_text
+
+# Candidates used as benchmark queries
+CANDIDATES_FILE = '../recommendation/candidate_skills.json'
+
+
+def directory_size(path):
+    files = [os.path.join(path, f) for f in os.listdir(path)]
+    return sum(os.path.getsize(f) for f in files), len(files)
+
+def exact_scores(cache, categories, skills):
+    """Exact set-cosine scores of every job in the categories, keyed by (category, row)."""
+    scores = {}
+    query_size = len(skills)
+    for category in categories:
+        entry = cache.get(category)
+        matrix = entry.skills.matrix
+        query = entry.skills.transform([skills])[0]
+        intersection = matrix @ query
+        sizes = np.diff(matrix.indptr)
+        category_scores = intersection / np.sqrt(np.maximum(sizes, 1) * query_size)
+        for row in np.flatnonzero(category_scores > 0):
+            scores[(entry.name, int(row))] = float(category_scores[row])
+    return scores
+
+def recall_at_k(hits, exact, k):
+    """Share of returned hits whose exact score reaches the exact k-th best (robust to ties)."""
+    if not exact:
+        return None
+    threshold = sorted(exact.values(), reverse=True)[:k][-1]
+    good = sum(1 for _, category, row, _ in hits[:k] if exact.get((category, row), 0) >= threshold - 1e-6)
+    return good / min(k, len(exact))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-category indexes with the single global index.")
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--set-sizes', type=int, nargs='+', default=[1, 20, 100])
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    candidates = pd.read_json(CANDIDATES_FILE)['skills[0]']
+    queries = [
+        sorted({preprocess_text(skill) for skill in skills} - {''})
+        for skills in candidates if isinstance(skills, list)
+    ]
+    queries = [skills for skills in queries if skills]
+
+    # Only the graphCreator2 indexes are compared with the global layout
+    cache = CategoryCache(memory_budget=float('inf'), incremental_dir=None)
+    global_index = GlobalIndex()
+    # Only categories that have a per-category index can be compared
+    categories = [c for c in global_index.categories if has_index(c)]
+
+    category_bytes, category_files = directory_size(CATEGORY_INDEX_DIR)
+    global_bytes, global_files = directory_size(GLOBAL_INDEX_DIR)
+    print(f"Per-category layout: {category_bytes / 1e6:.0f} MB in {category_files} files")
+    print(f"Global layout:       {global_bytes / 1e6:.0f} MB in {global_files} files")
+
+    rng = np.random.default_rng(args.seed)
+    for set_size in args.set_sizes:
+        timings = {'per-category': [], 'global': []}
+        recalls = {'per-category': [], 'global': []}
+        for q in rng.choice(len(queries), size=min(args.queries, len(queries)), replace=False):
+            skills = queries[q]
+            category_set = list(rng.choice(categories, size=min(set_size, len(categories)), replace=False))
+            for category in category_set:
+                cache.get(category)  # measure warm searches only
+
+            start = time.perf_counter()
+            per_category_hits, _, _ = search_categories(cache, category_set, skills, k=args.k, timeout=60)
+            timings['per-category'].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            global_hits = global_index.search(skills, category_set, k=args.k)
+            timings['global'].append(time.perf_counter() - start)
+
+            exact = exact_scores(cache, category_set, skills)
+            for layout, hits in (('per-category', per_category_hits), ('global', global_hits)):
+                recall = recall_at_k(hits, exact, args.k)
+                if recall is not None:
+                    recalls[layout].append(recall)
+
+        print(f"\n{set_size} categories per query:")
+        for layout in ('per-category', 'global'):
+            latencies = np.asarray(timings[layout]) * 1000
+            print(f"  {layout:<13} p50 {np.median(latencies):7.2f} ms  p95 {np.percentile(latencies, 95):7.2f} ms  "
+                  f"recall@{args.k} {np.mean(recalls[layout]):.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import os
+import time
+import argparse
+import numpy as np
+import faiss
+import faissGraphCreator as creator
+from embedding_cache import CACHE_DIR
+
+# (index type, re-rank) configurations compared against the exact baseline
+CONFIGURATIONS = [
+    ('flat', False),
+    ('sq8', False),
+    ('sq8', True),
+    ('ivfpq', False),
+    ('ivfpq', True),
+]
+
+
+def pooled_embeddings(categories, max_vectors):
+    """
+    Normalized embeddings of the categories' distinct skills texts, up to
+    max_vectors. Repeated texts are pooled once, so a held-out query never
+    has an identical copy of itself in the index.
+    """
+    selected = []
+    texts = {}
+    for category_name in categories:
+        if len(texts) >= max_vectors:
+            break
+        texts.update(dict.fromkeys(creator.category_texts(category_name)))
+        selected.append(category_name)
+
+    creator.encode_pending(selected)
+    embeddings = np.ascontiguousarray(creator.cache.lookup(list(texts)[:max_vectors]))
+    faiss.normalize_L2(embeddings)
+    return embeddings
+
+def recall_at_k(embeddings, queries, ids, truth_distances):
+    """
+    Share of returned hits at least as close as the exact k-th neighbour.
+    Duplicate skills texts have identical embeddings, so comparing ids
+    would count equally good ties as misses.
+    """
+    found = embeddings[np.maximum(ids, 0)]
+    distances = ((found - queries[:, None, :]) ** 2).sum(axis=2)
+    good = (ids >= 0) & (distances <= truth_distances[:, -1:] + 1e-4)
+    return good.sum(axis=1).mean() / truth_distances.shape[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall, QPS and bytes per vector of quantized embedding indexes.")
+    parser.add_argument('--max-vectors', type=int, default=20000, help="Embeddings pooled from the largest categories")
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    args = parser.parse_args()
+
+    creator.open_cache(args.cache_dir)
+    categories = creator.list_categories()
+    sizes = {category_name: os.path.getsize(creator.source_path(category_name)) for category_name in categories}
+    embeddings = pooled_embeddings(sorted(sizes, key=sizes.get, reverse=True), args.max_vectors)
+
+    # Queries are held out of the indexed vectors; a query that is also
+    # indexed finds itself at distance 0 and inflates recall
+    rng = np.random.default_rng(args.seed)
+    held_out = np.zeros(len(embeddings), dtype=bool)
+    held_out[rng.choice(len(embeddings), size=min(args.queries, len(embeddings) // 2), replace=False)] = True
+    queries = embeddings[held_out]
+    embeddings = np.ascontiguousarray(embeddings[~held_out])
+
+    # Exact baseline
+    exact = faiss.IndexFlatL2(creator.DIMENSION)
+    exact.add(embeddings)
+    start = time.perf_counter()
+    truth_distances, _ = exact.search(queries, args.k)
+    exact_qps = len(queries) / (time.perf_counter() - start)
+
+    print(f"{len(embeddings)} vectors, {len(queries)} queries, k={args.k}")
+    print(f"{'index':<14} {'bytes/vector':>12} {'build s':>8} {'QPS':>9} {'recall@' + str(args.k):>10}")
+    print(f"{'exact':<14} {creator.DIMENSION * 4:>12} {'-':>8} {exact_qps:>9.0f} {1:>10.3f}")
+
+    for index_type, rerank in CONFIGURATIONS:
+        start = time.perf_counter()
+        index, _, _ = creator.build_index(embeddings, index_type, rerank)
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, ids = index.search(queries, args.k)
+        qps = len(queries) / (time.perf_counter() - start)
+
+        bytes_per_vector = faiss.serialize_index(index).nbytes / index.ntotal
+        name = index_type + ('+rerank' if rerank else '')
+        print(f"{name:<14} {bytes_per_vector:>12.0f} {build_seconds:>8.2f} {qps:>9.0f} {recall_at_k(embeddings, queries, ids, truth_distances):>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import numpy as np
+from scipy import sparse
+
+# Bits per packed word
+WORD_BITS = 64
+
+# Supported metrics; hamming is a distance (smaller is better), the others similarities
+METRICS = ('cosine', 'jaccard', 'hamming')
+
+
+def n_words(n_bits):
+    return max((n_bits + WORD_BITS - 1) // WORD_BITS, 1)
+
+def pack_rows(matrix, n_bits=None):
+    """
+    Pack a binary matrix (dense or CSR) into rows of uint64 words.
+    Bit j of a row is bit j % 64 of word j // 64; padding bits are zero,
+    so any number of columns is supported.
+    """
+    n_bits = matrix.shape[1] if n_bits is None else n_bits
+    codes = np.zeros((matrix.shape[0], n_words(n_bits)), dtype=np.uint64)
+
+    if sparse.issparse(matrix):
+        matrix = sparse.csr_matrix(matrix)
+        rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+        columns = matrix.indices.astype(np.int64)
+    else:
+        rows, columns = np.nonzero(matrix)
+    np.bitwise_or.at(codes, (rows, columns // WORD_BITS), np.left_shift(np.uint64(1), (columns % WORD_BITS).astype(np.uint64)))
+    return codes
+
+def popcount(codes):
+    """Number of set bits per row."""
+    return np.bitwise_count(codes).sum(axis=1, dtype=np.int32)
+
+def intersections(query_codes, word_codes):
+    """
+    |Q & J| for every (query, job) pair, accumulated one word at a time.
+    `word_codes` is the word-major (words x jobs) layout of the job codes.
+    Skill sets are sparse, so most query words are zero and are skipped.
+    """
+    counts = np.zeros((query_codes.shape[0], word_codes.shape[1]), dtype=np.int32)
+    for word in range(query_codes.shape[1]):
+        rows = np.flatnonzero(query_codes[:, word])
+        if len(rows):
+            counts[rows] += np.bitwise_count(query_codes[rows, word, None] & word_codes[word][None, :])
+    return counts
+
+def set_scores(counts, query_sizes, job_sizes, metric='cosine'):
+    """Turn intersection counts into set cosine, Jaccard or Hamming values."""
+    query_sizes = np.asarray(query_sizes, dtype=np.float32).reshape(-1, 1)
+    job_sizes = np.asarray(job_sizes, dtype=np.float32).reshape(1, -1)
+    if metric == 'hamming':
+        return query_sizes + job_sizes - 2 * counts
+    if metric == 'jaccard':
+        denominator = query_sizes + job_sizes - counts
+    elif metric == 'cosine':
+        denominator = np.sqrt(query_sizes * job_sizes)
+    else:
+        raise ValueError(f"Unknown metric '{metric}', expected one of {METRICS}")
+    return np.divide(counts, denominator, out=np.zeros(counts.shape, dtype=np.float32), where=denominator > 0)
+
+def top_k(scores, k, largest=True):
+    """
+    Indices of the k best scores per row, best first.
+    Ties are broken by the lower index, so results are deterministic.
+    """
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    keys = -scores if largest else scores
+    candidates = np.argpartition(keys, k - 1, axis=1)[:, :k]
+    kth = np.take_along_axis(keys, candidates, axis=1).max(axis=1)
+
+    result = np.empty((scores.shape[0], k), dtype=np.int64)
+    for row in range(scores.shape[0]):
+        above = np.flatnonzero(keys[row] < kth[row])
+        ties = np.flatnonzero(keys[row] == kth[row])[:k - len(above)]
+        chosen = np.concatenate([above, ties])
+        result[row] = chosen[np.lexsort((chosen, keys[row][chosen]))]
+    return result
+
+
+class BinarySkillIndex:
+    """
+    Exact search over bit-packed binary skill vectors.
+    One bit per skill makes the codes 32x smaller than float32 vectors, and
+    popcount over AND-ed words gives exact intersections for many queries
+    at once, so no approximate graph is needed.
+    """
+
+    def __init__(self, codes, n_bits):
+        self.n_bits = n_bits
+        self.sizes = popcount(codes)
+        # Codes are stored job-major and searched word-major
+        self.word_codes = np.ascontiguousarray(np.asarray(codes).T)
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        return cls(pack_rows(matrix), matrix.shape[1])
+
+    @classmethod
+    def load(cls, path, n_bits):
+        return cls(np.load(path), n_bits)
+
+    @property
+    def codes(self):
+        return self.word_codes.T
+
+    @property
+    def ntotal(self):
+        return self.word_codes.shape[1]
+
+    @property
+    def nbytes(self):
+        return self.word_codes.nbytes + self.sizes.nbytes
+
+    def search(self, query_codes, k=5, metric='cosine', query_sizes=None):
+        """
+        Exact top-k for packed queries.
+        `query_sizes` defaults to the queries' popcounts; pass the full skill
+        counts when queries contain skills that have no bit in this index.
+        Returns (scores, ids), best first: largest cosine/Jaccard or smallest Hamming.
+        """
+        query_codes = np.ascontiguousarray(query_codes, dtype=np.uint64)
+        query_sizes = popcount(query_codes) if query_sizes is None else query_sizes
+        scores = set_scores(intersections(query_codes, self.word_codes), query_sizes, self.sizes, metric)
+        ids = top_k(scores, k, largest=metric != 'hamming')
+        return np.take_along_axis(scores, ids, axis=1), ids
@@ -0,0 +1,316 @@
+import os
+import heapq
+import threading
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import faiss
+from binary_skills import BinarySkillIndex, pack_rows
+from hnsw_tuning import apply_search_params
+from incremental_index import INDEX_DIR as INCREMENTAL_INDEX_DIR, IncrementalIndex, has_index as has_incremental_index
+from parallel_build import read_build_info
+from skill_store import SkillStore, STORE_DIR, category_key, preprocess_text
+
+# Directory with the indexes written by graphCreator2.py
+INDEX_DIR = './indexes'
+
+# Default memory budget for resident category indexes
+MEMORY_BUDGET = 2 * 1024 ** 3
+
+# Threads for cross-category searches (FAISS releases the GIL while searching)
+FANOUT_WORKERS = 8
+
+# Seconds after which categories that have not answered are dropped
+SHARD_TIMEOUT = 1.0
+
+# Hits scoring at or below this share no skill with the query (HNSW scores
+# carry float error around 0) and are not returned
+MIN_SCORE = 1e-6
+
+
+def get_index_filenames(category, index_dir=INDEX_DIR):
+    """Packed codes, HNSW index and mapping files of a category; graphCreator2 writes one of the first two."""
+    safe_category = category_key(category)
+    return (
+        os.path.join(index_dir, f"{safe_category}_bits.npy"),
+        os.path.join(index_dir, f"{safe_category}_hnsw.index"),
+        os.path.join(index_dir, f"{safe_category}_mapping.npy"),
+    )
+
+def has_index(category, index_dir=INDEX_DIR):
+    bits_file, index_file, mapping_file = get_index_filenames(category, index_dir)
+    return os.path.exists(mapping_file) and (os.path.exists(bits_file) or os.path.exists(index_file))
+
+
+class CategoryIndex:
+    """
+    A category's index together with its row mapping and the skill store
+    columns/titles needed to build queries and read results. The index is
+    either a BinarySkillIndex (exact) or a FAISS HNSW index (approximate).
+    """
+
+    def __init__(self, skills, index, mapping, nbytes):
+        self.skills = skills
+        self.index = index
+        self.mapping = mapping
+        self.nbytes = nbytes
+
+    @classmethod
+    def load(cls, store, category, index_dir=INDEX_DIR):
+        bits_file, index_file, mapping_file = get_index_filenames(category, index_dir)
+        if category not in store or not has_index(category, index_dir):
+            raise KeyError(f"No index for category '{category}'")
+
+        skills = store.load_category(category)
+        mapping = np.load(mapping_file)
+        if os.path.exists(bits_file):
+            index = BinarySkillIndex.load(bits_file, skills.dimension)
+            nbytes = index.nbytes + mapping.nbytes
+        else:
+            # Search parameters chosen by the tuner are kept in the build info
+            index = apply_search_params(faiss.read_index(index_file), read_build_info(index_dir, skills.name).get('search'))
+            # The serialized index is a close estimate of its resident size
+            nbytes = os.path.getsize(index_file) + mapping.nbytes
+        return cls(skills, index, mapping, nbytes)
+
+    @property
+    def name(self):
+        return self.skills.name
+
+    @property
+    def titles(self):
+        return self.skills.titles
+
+    def search(self, skill_lists, k=5):
+        """
+        Search with lists of preprocessed skills.
+        Returns (scores, rows): the cosine similarity |Q & J| / sqrt(|Q| |J|)
+        between the query's and each hit's skill sets, and the hit's category
+        row, best first. Missing hits have row -1 and score -inf, including
+        every hit of a query with no skill known in this category and hits
+        that share no skill with the query.
+        """
+        queries = self.skills.transform(skill_lists)
+        k = min(k, self.index.ntotal)
+
+        # The index only sees skills known to this category; rescale so the
+        # score uses the full query and is comparable across categories
+        query_sizes = np.array([len({skill for skill in skills if skill}) for skills in skill_lists], dtype=np.float32)
+        local_sizes = queries.sum(axis=1)
+
+        scores = np.full((len(skill_lists), k), -np.inf, dtype=np.float32)
+        rows = np.full((len(skill_lists), k), -1, dtype=np.int64)
+        known = queries.any(axis=1)
+        if k == 0 or not known.any():
+            return scores, rows
+
+        queries = np.ascontiguousarray(queries[known])
+        if isinstance(self.index, BinarySkillIndex):
+            # Exact set cosine; the full query size already makes it comparable
+            cosine, ids = self.index.search(pack_rows(queries), k, 'cosine', query_sizes[known])
+        else:
+            faiss.normalize_L2(queries)
+            distances, ids = self.index.search(queries, k)
+            # Both sides are unit vectors, so squared L2 distance = 2 - 2 * cosine
+            cosine = (1 - distances / 2) * np.sqrt(local_sizes[known] / query_sizes[known]).reshape(-1, 1)
+
+        found = (ids >= 0) & (cosine > MIN_SCORE)
+        scores[known] = np.where(found, cosine, -np.inf)
+        rows[known] = np.where(found, self.mapping[np.maximum(ids, 0)], -1)
+        return scores, rows
+
+
+class IncrementalCategoryIndex:
+    """
+    An IncrementalIndex behind the CategoryIndex interface, so ingested
+    postings are served. Rows are the stable job ids: a category
+    bootstrapped from the skill store keeps its row positions as ids and
+    ingested jobs are numbered after them.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.titles = np.full(index.next_id, '', dtype=object)
+        self.titles[np.fromiter(index.titles, dtype=np.int64, count=len(index.titles))] = list(index.titles.values())
+        self.nbytes = os.path.getsize(index.index_path()) + self.titles.nbytes
+
+    @property
+    def name(self):
+        return self.index.name
+
+    def search(self, skill_lists, k=5):
+        """Same scores as CategoryIndex.search; rows are job ids."""
+        distances, ids = self.index.search(skill_lists, k)
+        query_sizes = np.array([len({skill for skill in skills if skill}) for skills in skill_lists], dtype=np.float32)
+        local_sizes = np.array(
+            [len({skill for skill in skills if skill in self.index.column_ids}) for skills in skill_lists], dtype=np.float32,
+        )
+        # Both sides are unit vectors, so squared L2 distance = 2 - 2 * cosine
+        cosine = (1 - distances / 2) * np.sqrt(local_sizes / np.maximum(query_sizes, 1)).reshape(-1, 1)
+        found = (ids >= 0) & (cosine > MIN_SCORE)
+        return np.where(found, cosine, -np.inf).astype(np.float32), np.where(found, ids, -1)
+
+
+def load_category_index(store, category, index_dir=INDEX_DIR, incremental_dir=INCREMENTAL_INDEX_DIR):
+    """
+    A category's incremental index if it has one, so postings ingested
+    since the last graphCreator2 build are recommended, otherwise its
+    graphCreator2 index. Raises KeyError if it has neither.
+    """
+    if incremental_dir is not None and has_incremental_index(category, incremental_dir):
+        return IncrementalCategoryIndex(IncrementalIndex(category, incremental_dir))
+    return CategoryIndex.load(store, category, index_dir)
+
+
+class CategoryCache:
+    """
+    Loads category indexes on first use and keeps them resident, evicting
+    the least recently used ones when the memory budget is exceeded.
+    Incremental indexes are preferred; incremental_dir=None uses only the
+    graphCreator2 indexes.
+    """
+
+    def __init__(self, store_dir=STORE_DIR, index_dir=INDEX_DIR, memory_budget=MEMORY_BUDGET,
+                 incremental_dir=INCREMENTAL_INDEX_DIR):
+        self.store = SkillStore(store_dir)
+        self.index_dir = index_dir
+        self.incremental_dir = incremental_dir
+        self.memory_budget = memory_budget
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, category):
+        name = category_key(category)
+        with self.lock:
+            if name in self.entries:
+                self.entries.move_to_end(name)
+                self.hits += 1
+                return self.entries[name]
+
+            self.misses += 1
+
+        # Load outside the lock so hits on other categories are not blocked
+        entry = load_category_index(self.store, name, self.index_dir, self.incremental_dir)
+
+        with self.lock:
+            if name in self.entries:
+                # Another thread loaded it first
+                self.entries.move_to_end(name)
+                return self.entries[name]
+
+            self.entries[name] = entry
+            self.nbytes += entry.nbytes
+
+            # Always keep the entry just loaded, even if it alone exceeds the budget
+            while self.nbytes > self.memory_budget and len(self.entries) > 1:
+                _, evicted = self.entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+                self.evictions += 1
+            return entry
+
+    def stats(self):
+        with self.lock:
+            return {
+                'resident': len(self.entries),
+                'resident_bytes': self.nbytes,
+                'memory_budget': self.memory_budget,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+def search_shard(cache, category, skills, k):
+    """
+    Search one category; returns (score, category, row, title) hits.
+    Raises KeyError for a category without an index.
+    """
+    entry = cache.get(category)
+    scores, rows = entry.search([skills], k)
+    return [
+        (float(score), entry.name, int(row), str(entry.titles[row]))
+        for score, row in zip(scores[0], rows[0]) if row >= 0
+    ]
+
+def search_categories(cache, categories, user_skills, k=10, executor=None, timeout=SHARD_TIMEOUT):
+    """
+    Search several categories concurrently and merge the hits into one
+    global top-k, best first. Scores are cosine similarities, so they are
+    comparable across categories.
+
+    Categories that have not answered `timeout` seconds after the query
+    started are dropped instead of stalling it. Returns (hits, dropped,
+    missing) where hits are (score, category, row, title) tuples and
+    missing lists the categories without an index.
+    """
+    skills = [preprocess_text(skill) for skill in user_skills]
+    categories = list(dict.fromkeys(categories))
+
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ThreadPoolExecutor(max_workers=min(FANOUT_WORKERS, max(len(categories), 1)))
+    try:
+        futures = {executor.submit(search_shard, cache, category, skills, k): category for category in categories}
+        done, not_done = wait(futures, timeout=timeout)
+    finally:
+        if owns_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    dropped = []
+    missing = []
+    shard_hits = []
+    # Collect in request order so equal scores are ordered deterministically
+    for future, category in futures.items():
+        if future in not_done:
+            future.cancel()
+            dropped.append(category)
+            continue
+        try:
+            shard_hits.append(future.result())
+        except KeyError:
+            missing.append(category)
+        except Exception as e:
+            print(f"⚠️ Search failed for '{category}': {e}")
+            dropped.append(category)
+
+    # Each shard is sorted best first, so a heap merge yields the global top-k
+    merged = heapq.merge(*shard_hits, key=lambda hit: hit[0], reverse=True)
+    return list(islice(merged, k)), dropped, missing
+
+
+def recommend_batch(cache, categories, candidate_skills, candidate_ids=None, k=5):
+    """
+    Top-k jobs per category for many candidates.
+    Each category is searched once with all candidates as an N-row query.
+    Returns a DataFrame with one row per (candidate, category, rank) hit.
+    """
+    skill_lists = [[preprocess_text(skill) for skill in skills] for skills in candidate_skills]
+    candidate_ids = np.arange(len(skill_lists)) if candidate_ids is None else np.asarray(candidate_ids)
+
+    frames = []
+    for category in categories:
+        try:
+            entry = cache.get(category)
+        except KeyError:
+            continue
+        scores, rows = entry.search(skill_lists, k)
+        candidates, ranks = np.nonzero(rows >= 0)
+        hit_rows = rows[candidates, ranks]
+        frames.append(pd.DataFrame({
+            'candidate_id': candidate_ids[candidates],
+            'category': entry.name,
+            'rank': ranks + 1,
+            'row': hit_rows,
+            'title': entry.titles[hit_rows],
+            'score': scores[candidates, ranks],
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=['candidate_id', 'category', 'rank', 'row', 'title', 'score'])
+    return pd.concat(frames, ignore_index=True)
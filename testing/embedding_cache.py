@@ -0,0 +1,126 @@
+import os
+import json
+import hashlib
+import numpy as np
+from parallel_build import atomic_save_npy, atomic_write_json
+from skill_store import preprocess_text
+
+# Directory for cached embeddings, one subdirectory per model
+CACHE_DIR = './embedding_cache'
+
+MANIFEST_FILE = 'cache.json'
+KEYS_FILE = 'keys.npy'
+EMBEDDINGS_FILE = 'embeddings.f16'
+
+# Bytes of the SHA-256 digest kept as the key
+KEY_SIZE = 16
+
+# Texts per model call; one call covers all new texts, sorted by length
+ENCODE_BATCH_SIZE = 256
+
+
+def text_key(text):
+    """Content address of a normalized text."""
+    return hashlib.sha256(text.encode('utf-8')).digest()[:KEY_SIZE]
+
+
+class EmbeddingCache:
+    """
+    Content-addressed store of text embeddings.
+
+    Files in `cache_dir/<model>`:
+    - embeddings.f16: float16 rows, appended to and memory-mapped for reads
+    - keys.npy:       SHA-256 prefix of each row's normalized text, as uint8 rows
+    - cache.json:     model, dimension and the number of committed rows
+
+    Rows are appended before the manifest is rewritten, so rows beyond its
+    count come from an interrupted update and are ignored (and overwritten
+    by the next one).
+
+    Texts are encoded and keyed as normalized by `normalize`, preprocess_text
+    by default; pass another function where punctuation matters.
+    """
+
+    def __init__(self, model_name, dimension, cache_dir=CACHE_DIR, normalize=preprocess_text):
+        self.model_name = model_name
+        self.dimension = dimension
+        self.normalize = normalize
+        self.path = os.path.join(cache_dir, model_name.replace('/', '_'))
+        os.makedirs(self.path, exist_ok=True)
+
+        self.count = 0
+        manifest_path = os.path.join(self.path, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as file:
+                manifest = json.load(file)
+            if manifest['dimension'] != dimension:
+                raise ValueError(f"Cache in '{self.path}' has dimension {manifest['dimension']}, expected {dimension}")
+            self.count = manifest['count']
+
+        # Raw uint8 rows, since fixed-width bytes dtypes drop trailing NULs
+        keys = np.load(os.path.join(self.path, KEYS_FILE))[:self.count] if self.count else np.empty((0, KEY_SIZE), dtype=np.uint8)
+        self.keys = [key.tobytes() for key in keys]
+        self.rows = {key: row for row, key in enumerate(self.keys)}
+        self.embeddings = self.map_embeddings()
+
+    def map_embeddings(self):
+        if not self.count:
+            return np.empty((0, self.dimension), dtype=np.float16)
+        return np.memmap(
+            os.path.join(self.path, EMBEDDINGS_FILE), dtype=np.float16, mode='r', shape=(self.count, self.dimension),
+        )
+
+    def __len__(self):
+        return self.count
+
+    def missing(self, texts):
+        """Normalized texts (deduplicated) that have no cached embedding."""
+        normalized = dict.fromkeys(self.normalize(text) for text in texts)
+        return [text for text in normalized if text_key(text) not in self.rows]
+
+    def update(self, texts, model, batch_size=ENCODE_BATCH_SIZE):
+        """
+        Encode the texts that are not cached yet and append them.
+        All new texts go to the model in one call, sorted by length so each
+        batch pads to similar lengths. Returns the number of texts encoded.
+        """
+        new_texts = sorted(self.missing(texts), key=len)
+        if not new_texts:
+            return 0
+
+        embeddings = model.encode(new_texts, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=True)
+        embeddings = np.asarray(embeddings, dtype=np.float16).reshape(len(new_texts), self.dimension)
+
+        with open(os.path.join(self.path, EMBEDDINGS_FILE), 'r+b' if self.count else 'wb') as file:
+            file.seek(self.count * self.dimension * embeddings.itemsize)
+            file.write(embeddings.tobytes())
+            file.truncate()
+
+        for text in new_texts:
+            key = text_key(text)
+            self.rows[key] = len(self.keys)
+            self.keys.append(key)
+        self.count = len(self.keys)
+
+        keys = np.frombuffer(b''.join(self.keys), dtype=np.uint8).reshape(-1, KEY_SIZE)
+        atomic_save_npy(os.path.join(self.path, KEYS_FILE), keys)
+        atomic_write_json(os.path.join(self.path, MANIFEST_FILE), {
+            'model': self.model_name,
+            'dimension': self.dimension,
+            'count': self.count,
+        })
+        self.embeddings = self.map_embeddings()
+        return len(new_texts)
+
+    def lookup(self, texts):
+        """
+        float32 embeddings of the texts, in order.
+        Raises KeyError for a text that has not been encoded with update().
+        """
+        rows = []
+        for text in texts:
+            key = text_key(self.normalize(text))
+            if key not in self.rows:
+                raise KeyError(f"No cached embedding for '{text}'")
+            rows.append(self.rows[key])
+        return np.asarray(self.embeddings[np.asarray(rows, dtype=np.int64)], dtype=np.float32).reshape(len(rows), self.dimension)
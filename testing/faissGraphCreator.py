@@ -1,80 +1,194 @@
 import os
-import pandas as pd
+import argparse
+from functools import partial
 import numpy as np
 import faiss
 from sentence_transformers import SentenceTransformer
-from preprocessing2 import preprocess
-
-# Directory containing CSV files
-CSV_DIR = './subsets'
-INDEX_DIR = './indexes'
+from embedding_cache import CACHE_DIR, EmbeddingCache
+from hnsw_tuning import TARGET_RECALL, apply_search_params, tune_index
+from skill_store import preprocess_series
+from subset_loader import list_categories, load_category, source_path
+from parallel_build import BUILT, FAILED, SKIPPED, atomic_save_npy, atomic_write_index, file_digest, fingerprint, is_up_to_date, record_build, run_builds
+
+# Directory for saving FAISS index/mapping files and build info. Kept apart
+# from graphCreator2's './indexes', which uses the same per-category file names
+INDEX_DIR = './embedding_indexes'
 os.makedirs(INDEX_DIR, exist_ok=True)
 
-# Load the sentence transformer model
-MODEL = SentenceTransformer('all-MiniLM-L6-v2')
+# Sentence transformer model; only loaded when there are new texts to encode
+MODEL_NAME = 'all-MiniLM-L6-v2'
 
-# FAISS HNSW index parameters
+# FAISS HNSW index parameters, used when tuning is off
 DIMENSION = 384  # Embedding size for 'all-MiniLM-L6-v2'
 M = 32           # Number of neighbors in HNSW graph
 EF_CONSTRUCTION = 200  # Search depth for HNSW graph
 
-def process_csv(csv_file):
-    """Process a single CSV file and create FAISS index."""
-    category_name = csv_file.replace('_subset.csv', '')
+# Index types:
+# - flat:  HNSW over float32 vectors (1536 bytes per vector)
+# - sq8:   HNSW over 8-bit scalar-quantized vectors (384 bytes per vector)
+# - ivfpq: IVF with product-quantized codes (at most PQ_M bytes per vector)
+INDEX_TYPES = ('flat', 'sq8', 'ivfpq')
+INDEX_TYPE = 'flat'
+
+# IVF-PQ parameters. Each codebook needs about 39 training vectors per
+# centroid, so smaller categories get fewer bits per code, and categories
+# below PQ_MIN_ROWS fall back to sq8
+PQ_M = 48          # Sub-quantizers, 8 dimensions each
+PQ_MAX_BITS = 8    # Bits per sub-quantizer code
+PQ_MIN_ROWS = 1024
+POINTS_PER_CENTROID = 39
+NPROBE = 8
+
+# With re-ranking the quantized index returns RERANK_FACTOR * k candidates,
+# which are re-scored with the exact float32 vectors
+RERANK_FACTOR = 4
+
+# Embedding cache opened once per (worker) process
+cache = None
+
+def open_cache(cache_dir=CACHE_DIR):
+    global cache
+    cache = EmbeddingCache(MODEL_NAME, DIMENSION, cache_dir)
+
+def get_index_filenames(category_name):
+    return (
+        os.path.join(INDEX_DIR, f"{category_name}_hnsw.index"),
+        os.path.join(INDEX_DIR, f"{category_name}_mapping.npy"),
+    )
+
+def build_fingerprint(category_name, index_type=INDEX_TYPE, rerank=False, target_recall=TARGET_RECALL):
+    params = {'model': MODEL_NAME, 'index_type': index_type, 'rerank': rerank}
+    if target_recall:
+        params['target_recall'] = target_recall
+    else:
+        params.update({'M': M, 'efConstruction': EF_CONSTRUCTION})
+    return fingerprint([file_digest(source_path(category_name))], params)
+
+def is_pending(category_name, index_type=INDEX_TYPE, rerank=False, target_recall=TARGET_RECALL):
+    index_file, mapping_file = get_index_filenames(category_name)
+    category_fingerprint = build_fingerprint(category_name, index_type, rerank, target_recall)
+    return not is_up_to_date(INDEX_DIR, category_name, category_fingerprint, [index_file, mapping_file])
+
+def effective_index_type(index_type, n_vectors):
+    if index_type == 'ivfpq' and n_vectors < PQ_MIN_ROWS:
+        return 'sq8'
+    return index_type
+
+def pq_bits(n_vectors):
+    return int(min(PQ_MAX_BITS, np.log2(n_vectors / POINTS_PER_CENTROID)))
+
+def make_index(index_type, n_vectors, m=M, ef_construction=EF_CONSTRUCTION):
+    """Create an untrained L2 index; on normalized embeddings it ranks like cosine."""
+    if index_type == 'flat':
+        index = faiss.IndexHNSWFlat(DIMENSION, m)
+    elif index_type == 'sq8':
+        index = faiss.IndexHNSWSQ(DIMENSION, faiss.ScalarQuantizer.QT_8bit, m)
+    elif index_type == 'ivfpq':
+        nlist = max(1, int(np.sqrt(n_vectors)))
+        index = faiss.IndexIVFPQ(faiss.IndexFlatL2(DIMENSION), DIMENSION, nlist, PQ_M, pq_bits(n_vectors))
+        index.nprobe = min(NPROBE, nlist)
+        return index
+    else:
+        raise ValueError(f"Unknown index type '{index_type}', expected one of {INDEX_TYPES}")
+    index.hnsw.efConstruction = ef_construction
+    return index
+
+def make_flat(index_type):
+    """Exact scan over the same vector encoding as index_type."""
+    if index_type == 'sq8':
+        return faiss.IndexScalarQuantizer(DIMENSION, faiss.ScalarQuantizer.QT_8bit)
+    return faiss.IndexFlatL2(DIMENSION)
+
+def build_index(embeddings, index_type=INDEX_TYPE, rerank=False, target_recall=None):
+    """
+    Train (where needed) and fill an index with L2-normalized embeddings.
+    HNSW-based types are auto-tuned when a target recall is given.
+    Returns (index, index_type, search_params) with the type actually used.
+    """
+    n_vectors = len(embeddings)
+    index_type = effective_index_type(index_type, n_vectors)
+    params = None
+    if target_recall and index_type != 'ivfpq':
+        index, params = tune_index(
+            embeddings, lambda m: make_index(index_type, n_vectors, m), lambda: make_flat(index_type),
+            target_recall=target_recall,
+        )
+        if not rerank or index_type == 'flat':
+            return index, index_type, params
+        # IndexRefineFlat has to start empty, so the chosen setting is rebuilt inside it
+        if params['index'] == 'flat':
+            index = make_flat(index_type)
+        else:
+            index = make_index(index_type, n_vectors, params['M'], params['efConstruction'])
+    else:
+        index = make_index(index_type, n_vectors)
+
+    if rerank and index_type != 'flat':
+        index = faiss.IndexRefineFlat(index)
+        index.k_factor = RERANK_FACTOR
+    if not index.is_trained:
+        index.train(embeddings)
+    index.add(embeddings)
+    return apply_search_params(index, params), index_type, params
+
+def category_texts(category_name):
+    """Preprocessed non-empty skills texts (column 10) of a category, indexed by row position."""
+    # Only the skills column is embedded
+    df = load_category(category_name, columns=[10])
+    if 10 not in df.columns:
+        raise KeyError(f"Column 10 not found in {category_name}. Available columns: {df.columns}")
+
+    texts = preprocess_series(df[10].astype(str))
+    # Remove rows with empty text after preprocessing
+    return texts[texts != '']
+
+def encode_pending(categories):
+    """
+    Encode the texts of all categories that need a build in one pass.
+    Strings shared between rows or categories, or cached by an earlier
+    run, are not encoded again.
+    """
+    texts = []
+    for category_name in categories:
+        try:
+            texts.extend(category_texts(category_name))
+        except Exception as e:
+            print(f"❌ Error reading {category_name}: {e}")
+
+    new_texts = cache.missing(texts)
+    print(f"🧠 {len(texts)} texts, {len(new_texts)} not in the embedding cache")
+    if new_texts:
+        cache.update(new_texts, SentenceTransformer(MODEL_NAME))
+
+def process_category(category_name, force=False, index_type=INDEX_TYPE, rerank=False, target_recall=TARGET_RECALL):
+    """
+    Process a single category and create FAISS index from cached
+    embeddings. Categories whose source file and index parameters are
+    unchanged since the last build are skipped.
+    """
+    index_file, mapping_file = get_index_filenames(category_name)
+    category_fingerprint = build_fingerprint(category_name, index_type, rerank, target_recall)
+    if not force and is_up_to_date(INDEX_DIR, category_name, category_fingerprint, [index_file, mapping_file]):
+        return SKIPPED
+
     print(f"\n📌 Processing category: {category_name}")
 
-    csv_path = os.path.join(CSV_DIR, csv_file)
-    
     try:
-        df = pd.read_csv(csv_path, header=None)
+        texts = category_texts(category_name)
     except Exception as e:
-        print(f"❌ Error reading {csv_file}: {e}")
-        return
+        print(f"❌ Error reading {category_name}: {e}")
+        return FAILED
 
-    print("🔍 CSV Columns:", df.columns)
-    
-    if 10 not in df.columns:
-        print(f"❌ Column 10 not found in {csv_file}. Available columns: {df.columns}")
-        return
-    
-    # Preprocess text data
-    print("⚙️ Preprocessing text data...")
-    import re
-    import unicodedata
-
-    def preprocess_text(text):
-        # Ensure text is a string
-        if not isinstance(text, str):
-            return ''
-        # Unicode normalization
-        text = unicodedata.normalize('NFKD', text)
-        # Lowercase
-        text = text.lower()
-        # Remove special characters and punctuation
-        text = re.sub(r'[^\w\s]', '', text)
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
-    df[10] = df[10].astype(str).apply(preprocess_text)
-    
-    # Remove rows with empty text after preprocessing
-    df = df[df[10].str.strip() != '']
- 
-    
-    # Convert the text data to a list
-    texts = df[10].tolist()
-    
-    if not texts:
+    if texts.empty:
         print("❌ Preprocessing returned an empty list. Skipping file.")
-        return
+        return SKIPPED
 
-    # Convert text to embeddings
-    print("🧠 Generating embeddings...")
-    embeddings = MODEL.encode(texts, convert_to_numpy=True, show_progress_bar=True)
+    # Embeddings were computed by encode_pending()
+    embeddings = cache.lookup(texts)
 
     if embeddings is None or embeddings.shape[0] == 0:
         print("❌ No embeddings generated. Skipping file.")
-        return
+        return SKIPPED
 
     print(f"✅ Embedding shape: {embeddings.shape}")
 
@@ -86,31 +200,55 @@ def process_csv(csv_file):
     faiss.normalize_L2(embeddings)
 
     # Create FAISS index
-    print("⚡ Building FAISS HNSW index...")
-    index = faiss.IndexHNSWFlat(DIMENSION, M)
-    index.hnsw.efConstruction = EF_CONSTRUCTION
-    index.add(embeddings)
+    print(f"⚡ Building FAISS {effective_index_type(index_type, len(embeddings))} index...")
+    index, built_type, search_params = build_index(embeddings, index_type, rerank, target_recall)
+    if search_params:
+        print(f"✅ Tuned parameters: {search_params}")
 
     # Save the FAISS index
-    index_file = os.path.join(INDEX_DIR, f"{category_name}_hnsw.index")
-    faiss.write_index(index, index_file)
+    atomic_write_index(index, index_file)
     print(f"✅ Index saved: {index_file}")
 
     # Save the index-to-data mapping
-    mapping_file = os.path.join(INDEX_DIR, f"{category_name}_mapping.npy")
-    np.save(mapping_file, df.index.to_numpy())
+    atomic_save_npy(mapping_file, texts.index.to_numpy())
     print(f"✅ Mapping saved: {mapping_file}")
 
+    record_build(
+        INDEX_DIR, category_name, category_fingerprint,
+        rows=len(texts), index_type=built_type, rerank=rerank, search=search_params,
+    )
+    return BUILT
+
 def main():
-    """Main function to process all CSV files."""
-    csv_files = [f for f in os.listdir(CSV_DIR) if f.endswith('_subset.csv')]
-    
-    if not csv_files:
+    """Main function to process all categories."""
+    parser = argparse.ArgumentParser(description="Build per-category FAISS HNSW indexes over skill embeddings.")
+    parser.add_argument('--workers', type=int, default=1, help="Number of build processes")
+    parser.add_argument('--force', action='store_true', help="Rebuild categories whose inputs are unchanged")
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="Embedding cache directory")
+    parser.add_argument('--index-type', choices=INDEX_TYPES, default=INDEX_TYPE, help="Vector compression of the index")
+    parser.add_argument('--rerank', action='store_true', help="Re-rank quantized results with the exact vectors")
+    parser.add_argument('--target-recall', type=float, default=TARGET_RECALL, help="Recall@10 HNSW indexes are tuned for")
+    parser.add_argument('--no-tune', action='store_true', help="Use the fixed M / efConstruction for HNSW indexes")
+    args = parser.parse_args()
+
+    categories = list_categories()
+    if not categories:
         print("❌ No CSV files found in the directory.")
         return
 
-    for csv_file in csv_files:
-        process_csv(csv_file)
+    open_cache(args.cache_dir)
+    target_recall = None if args.no_tune else args.target_recall
+    encode_pending(categories if args.force else [
+        category_name for category_name in categories
+        if is_pending(category_name, args.index_type, args.rerank, target_recall)
+    ])
+
+    # Schedule by source file size, largest first
+    sizes = {category_name: os.path.getsize(source_path(category_name)) for category_name in categories}
+    build = partial(
+        process_category, force=args.force, index_type=args.index_type, rerank=args.rerank, target_recall=target_recall,
+    )
+    run_builds(build, sizes, workers=args.workers, initializer=open_cache, initargs=(args.cache_dir,))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,178 @@
+import os
+import json
+import argparse
+import numpy as np
+import faiss
+from skill_store import SkillStore, STORE_DIR, category_key, preprocess_text
+from parallel_build import atomic_save_npy, atomic_write_index, atomic_write_json
+
+# Directory for the single global index
+INDEX_DIR = './global_index'
+
+# The global vocabulary is far too wide for dense vectors, so skills are
+# feature-hashed (with random signs) into this many dimensions
+DIMENSION = 1024
+HASH_SEED = 0
+
+# Hashed scores are re-ranked exactly, so this many times k candidates
+# are fetched to still fill k hits after collisions are dropped
+RERANK_FACTOR = 4
+
+
+def hash_tables(vocabulary_size, dimension=DIMENSION, seed=HASH_SEED):
+    """Bucket and sign of every global skill id."""
+    rng = np.random.default_rng(seed)
+    buckets = rng.integers(0, dimension, size=vocabulary_size).astype(np.int64)
+    signs = rng.choice(np.array([-1, 1], dtype=np.float32), size=vocabulary_size)
+    return buckets, signs
+
+def hashed_vectors(id_lists, buckets, signs, dimension, sizes=None):
+    """
+    Hashed vectors for lists of global skill ids, scaled by 1 / sqrt(size).
+    The inner product of two such vectors is an unbiased estimate of the set
+    cosine |A & B| / sqrt(|A| |B|); `sizes` defaults to the number of ids.
+    """
+    vectors = np.zeros((len(id_lists), dimension), dtype=np.float32)
+    for row, ids in enumerate(id_lists):
+        np.add.at(vectors[row], buckets[ids], signs[ids])
+    sizes = [len(ids) for ids in id_lists] if sizes is None else sizes
+    vectors /= np.sqrt(np.maximum(np.asarray(sizes, dtype=np.float32), 1)).reshape(-1, 1)
+    return vectors
+
+
+def build_global_index(store, index_dir=INDEX_DIR, dimension=DIMENSION):
+    """
+    Build one inner-product IVF index over the jobs of every category.
+    Each category is one inverted list, assigned directly instead of by a
+    trained quantizer, so a search over any set of categories scans
+    exactly those lists in a single call.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    categories = store.categories
+    buckets, signs = hash_tables(len(store.vocabulary), dimension)
+
+    # The coarse quantizer is never used for assignment, only to size the lists
+    quantizer = faiss.IndexFlatIP(dimension)
+    quantizer.add(np.zeros((len(categories), dimension), dtype=np.float32))
+    index = faiss.IndexIVFScalarQuantizer(
+        quantizer, dimension, len(categories), faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT,
+    )
+    index.train(np.zeros((1, dimension), dtype=np.float32))
+
+    job_categories = []
+    job_rows = []
+    for list_id, category_name in enumerate(categories):
+        skills = store.load_category(category_name)
+        matrix = skills.matrix
+        rows = np.flatnonzero(np.diff(matrix.indptr) > 0)
+        if not len(rows):
+            continue
+
+        id_lists = [skills.columns[matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]] for row in rows]
+        vectors = hashed_vectors(id_lists, buckets, signs, dimension)
+
+        ids = np.arange(len(job_rows), len(job_rows) + len(rows), dtype=np.int64)
+        assign = np.full(len(rows), list_id, dtype=np.int64)
+        index.add_core(len(rows), faiss.swig_ptr(vectors), faiss.swig_ptr(ids), faiss.swig_ptr(assign))
+
+        job_categories.extend([list_id] * len(rows))
+        job_rows.extend(rows.tolist())
+
+    atomic_write_index(index, os.path.join(index_dir, 'global_ivf.index'))
+    atomic_save_npy(os.path.join(index_dir, 'job_categories.npy'), np.asarray(job_categories, dtype=np.int32))
+    atomic_save_npy(os.path.join(index_dir, 'job_rows.npy'), np.asarray(job_rows, dtype=np.int64))
+    atomic_write_json(os.path.join(index_dir, 'global_manifest.json'), {
+        'categories': categories,
+        'dimension': dimension,
+        'hash_seed': HASH_SEED,
+        'vocabulary_size': len(store.vocabulary),
+        'jobs': len(job_rows),
+    })
+    print(f"✅ Global index saved: {len(job_rows)} jobs in {len(categories)} category lists")
+
+
+class GlobalIndex:
+    """Single-index layout: category is a filter applied by choosing inverted lists."""
+
+    def __init__(self, store_dir=STORE_DIR, index_dir=INDEX_DIR):
+        self.store = SkillStore(store_dir)
+        with open(os.path.join(index_dir, 'global_manifest.json'), 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+        if manifest['vocabulary_size'] != len(self.store.vocabulary):
+            raise ValueError("Global index was built from a different skill store; rebuild it")
+
+        self.categories = manifest['categories']
+        self.list_ids = {category_name: i for i, category_name in enumerate(self.categories)}
+        self.dimension = manifest['dimension']
+        self.buckets, self.signs = hash_tables(manifest['vocabulary_size'], self.dimension, manifest['hash_seed'])
+
+        self.index = faiss.read_index(os.path.join(index_dir, 'global_ivf.index'))
+        # Fixed so concurrent searches never change shared index state
+        self.index.nprobe = self.index.nlist
+        self.job_categories = np.load(os.path.join(index_dir, 'job_categories.npy'))
+        self.job_rows = np.load(os.path.join(index_dir, 'job_rows.npy'))
+        self.category_skills = {}
+
+    @property
+    def nbytes(self):
+        return self.index.sa_code_size() * self.index.ntotal + self.job_categories.nbytes + self.job_rows.nbytes
+
+    def load_category(self, list_id):
+        """Skill matrix of an index list's category, loaded on first use."""
+        if list_id not in self.category_skills:
+            self.category_skills[list_id] = self.store.load_category(self.categories[list_id])
+        return self.category_skills[list_id]
+
+    def search(self, user_skills, categories, k=10):
+        """
+        One search over the given categories.
+        Returns (score, category, row, title) hits, best first, like
+        category_index.search_categories.
+
+        Hashed scores are only estimates: bucket collisions give jobs that
+        share no skill with the query nonzero scores. The hits are checked
+        against the jobs' exact skill sets; jobs sharing no skill are
+        dropped and the rest are re-ranked by the exact set cosine.
+        """
+        skills = {preprocess_text(skill) for skill in user_skills} - {''}
+        ids = np.asarray([self.store.skill_ids[skill] for skill in skills if skill in self.store.skill_ids], dtype=np.int64)
+        list_ids = np.asarray(
+            [self.list_ids[category_key(category)] for category in dict.fromkeys(categories) if category_key(category) in self.list_ids],
+            dtype=np.int64,
+        )
+        if not len(ids) or not len(list_ids):
+            return []
+
+        # Skills unknown to every job still count towards the query size
+        query = hashed_vectors([ids], self.buckets, self.signs, self.dimension, sizes=[len(skills)])
+        # Probe exactly the requested categories' lists; FAISS skips the -1 padding
+        assign = np.full((1, self.index.nprobe), -1, dtype=np.int64)
+        assign[0, :len(list_ids)] = list_ids
+        _, labels = self.index.search_preassigned(query, k * RERANK_FACTOR, assign, np.zeros(assign.shape, dtype=np.float32))
+
+        hits = []
+        for label in labels[0]:
+            if label < 0:
+                continue
+            list_id = int(self.job_categories[label])
+            row = int(self.job_rows[label])
+            category = self.load_category(list_id)
+            matrix = category.matrix
+            job_ids = category.columns[matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]]
+            shared = np.isin(job_ids, ids).sum()
+            if not shared:
+                continue
+            score = shared / np.sqrt(len(skills) * len(job_ids))
+            hits.append((float(score), self.categories[list_id], row, str(category.titles[row])))
+        hits.sort(key=lambda hit: hit[0], reverse=True)
+        return hits[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the single global category-filtered index.")
+    parser.add_argument('--dimension', type=int, default=DIMENSION, help="Hashed vector dimension")
+    args = parser.parse_args()
+    build_global_index(SkillStore(), dimension=args.dimension)
+
+if __name__ == "__main__":
+    main()
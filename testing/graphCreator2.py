@@ -1,124 +1,175 @@
 import os
-import pandas as pd
-import unicodedata
+import argparse
+from functools import partial
 import numpy as np
+import pandas as pd
 import faiss
-from sklearn.preprocessing import MultiLabelBinarizer
-import re
+from binary_skills import pack_rows
+from hnsw_tuning import TARGET_RECALL, tune_index
+from skill_store import SkillStore, STORE_DIR, preprocess_text
+from parallel_build import BUILT, SKIPPED, atomic_save_npy, atomic_write_index, file_digest, fingerprint, is_up_to_date, read_build_info, record_build, run_builds
 
-# Directories for CSV files and for saving FAISS index/mapping files
-CSV_DIR = './subsets'
+# Directory for saving FAISS index/mapping files
 INDEX_DIR = './indexes'
 os.makedirs(INDEX_DIR, exist_ok=True)
 
-# FAISS index parameters
+# FAISS index parameters, used for the float layout when tuning is off
 M = 32                 # Number of neighbors in HNSW graph
 EF_CONSTRUCTION = 200  # Search depth for HNSW graph
 
-def preprocess_text(text):
-    """
-    Preprocess text by normalizing Unicode, converting to lowercase,
-    removing punctuation, and extra whitespace.
-    """
-    if not isinstance(text, str):
-        return ''
-    text = unicodedata.normalize('NFKD', text)
-    text = text.lower()
-    text = re.sub(r'[^\w\s]', '', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
-
-def preprocess_and_split(text):
+# Index layouts: bit-packed codes searched exactly, or float32 vectors in HNSW
+BINARY = 'binary'
+FLOAT = 'float'
+LAYOUT = BINARY
+
+# Candidate profiles used as tuning queries for the float layout, if present
+TUNING_QUERIES_FILE = '../recommendation/candidate_skills.json'
+
+# Skill store (and tuning queries) opened once per (worker) process
+store = None
+tuning_skill_lists = None
+tuning_digest = None
+
+def open_store(store_dir=STORE_DIR, queries_file=None):
+    global store, tuning_skill_lists, tuning_digest
+    store = SkillStore(store_dir)
+    if queries_file and os.path.exists(queries_file):
+        candidates = pd.read_json(queries_file)['skills[0]']
+        tuning_skill_lists = [[preprocess_text(skill) for skill in skills] for skills in candidates if isinstance(skills, list)]
+        tuning_digest = file_digest(queries_file)
+
+def get_index_filenames(category_name, layout=LAYOUT):
+    index_name = f"{category_name}_bits.npy" if layout == BINARY else f"{category_name}_hnsw.index"
+    return (
+        os.path.join(INDEX_DIR, index_name),
+        os.path.join(INDEX_DIR, f"{category_name}_mapping.npy"),
+    )
+
+def process_category(category_name, force=False, layout=LAYOUT, target_recall=TARGET_RECALL):
     """
-    Preprocess the text and then split it into a list of skills.
-    Assumes that skills in the original text are comma-separated.
+    Create an index for one category from its binary job x skill matrix in
+    the compiled skill store: packed bit codes by default, or a FAISS HNSW
+    index over float32 vectors. With a target recall the float index is
+    auto-tuned (see hnsw_tuning.py); otherwise it uses M / EF_CONSTRUCTION.
+    Categories whose matrix and index parameters are unchanged since the
+    last build are skipped.
     """
-    processed_text = preprocess_text(text)
-    # Split on commas and remove empty tokens
-    skills = [skill.strip() for skill in processed_text.split(',') if skill.strip()]
-    return skills
+    skills = store.load_category(category_name)
+    index_file, mapping_file = get_index_filenames(category_name, layout)
+
+    # The index only depends on the local matrix, not on global skill ids
+    if layout == BINARY:
+        params = {'layout': layout}
+    elif target_recall:
+        params = {'target_recall': target_recall, 'queries': tuning_digest}
+    else:
+        params = {'M': M, 'efConstruction': EF_CONSTRUCTION}
+    build_fingerprint = fingerprint([skills.matrix.indptr, skills.matrix.indices, skills.dimension], params)
+    if not force and is_up_to_date(INDEX_DIR, category_name, build_fingerprint, [index_file, mapping_file]):
+        return SKIPPED
 
-def process_csv(csv_file):
-    """
-    Process a single CSV file and create a FAISS index using a binary
-    representation generated by MultiLabelBinarizer.
-    """
-    # Derive category name from CSV filename
-    category_name = csv_file.replace('_subset.csv', '')
     print(f"\n📌 Processing category: {category_name}")
+    print(f"✅ Unique skills count (vocabulary): {skills.dimension}")
 
-    csv_path = os.path.join(CSV_DIR, csv_file)
-    try:
-        df = pd.read_csv(csv_path, header=None)
-    except Exception as e:
-        print(f"❌ Error reading {csv_file}: {e}")
-        return
-
-    if 10 not in df.columns:
-        print(f"❌ Column 10 not found in {csv_file}. Available columns: {df.columns}")
-        return
-
-    # Preprocess and split column 10 into a list of skills
-    df[10] = df[10].astype(str).apply(preprocess_and_split)
-
-    # Remove rows that end up with no skills
-    df = df[df[10].apply(lambda skills: len(skills) > 0)]
-    
-    # Build the vocabulary from the dataset (a list of unique skills)
-    all_skills = [skill for sublist in df[10] for skill in sublist]
-    unique_skills = sorted(list(set(all_skills)))
-    print(f"✅ Unique skills count (vocabulary): {len(unique_skills)}")
-
-    if not unique_skills:
+    if not skills.dimension:
         print("❌ No skills found in dataset, skipping index generation.")
-        return
+        return SKIPPED
 
-    # Use MultiLabelBinarizer to transform lists of skills into binary feature vectors
-    mlb = MultiLabelBinarizer(classes=unique_skills)
-    mlb.fit(df[10])
-    skill_vectors = mlb.transform(df[10])
-
-    if skill_vectors.shape[0] == 0:
+    # Remove rows that have no skills
+    rows = np.flatnonzero(np.diff(skills.matrix.indptr) > 0)
+    if len(rows) == 0:
         print("❌ No valid binary features generated. Skipping file.")
-        return
+        return SKIPPED
+
+    search_params = None
+    if layout == BINARY:
+        codes = pack_rows(skills.matrix[rows])
+        print(f"✅ Packed codes shape: {codes.shape} ({codes.nbytes} bytes)")
+        atomic_save_npy(index_file, codes)
+    else:
+        queries = None
+        if tuning_skill_lists:
+            queries = skills.transform(tuning_skill_lists)
+            queries = np.ascontiguousarray(queries[queries.any(axis=1)])
+            faiss.normalize_L2(queries)
+        search_params = build_hnsw(skills.matrix[rows].toarray(), index_file, target_recall, queries)
+    print(f"✅ Index saved: {index_file}")
 
+    # Save a mapping from index IDs to the category's row positions
+    atomic_save_npy(mapping_file, rows)
+    print(f"✅ Mapping saved: {mapping_file}")
+
+    # Only one layout is kept per category. The previous file is removed
+    # only if this builder's last build info records it as its own layout
+    previous_layout = read_build_info(INDEX_DIR, category_name).get('layout')
+    if previous_layout in (BINARY, FLOAT) and previous_layout != layout:
+        previous_file, _ = get_index_filenames(category_name, previous_layout)
+        if os.path.exists(previous_file):
+            os.remove(previous_file)
+
+    record_build(
+        INDEX_DIR, category_name, build_fingerprint,
+        rows=len(rows), dimension=skills.dimension, layout=layout, search=search_params,
+    )
+    return BUILT
+
+def build_hnsw(skill_vectors, index_file, target_recall=TARGET_RECALL, queries=None):
+    """
+    Build and save a FAISS HNSW (or, if tuning picks it, flat) index over
+    L2-normalized float32 vectors. Returns the chosen parameters.
+    """
     print(f"✅ Binary feature matrix shape: {skill_vectors.shape}")
 
-    # Convert to float32 and normalize for FAISS
-    skill_vectors = skill_vectors.astype(np.float32)
+    # Normalize for FAISS
     faiss.normalize_L2(skill_vectors)
 
-    # FAISS index dimension equals the number of unique skills
+    # FAISS index dimension equals the number of unique skills in the category
     dimension = skill_vectors.shape[1]
     print(f"✅ Feature vector dimension: {dimension}")
 
-    # Create FAISS HNSW index and add the binary vectors
-    print("⚡ Building FAISS HNSW index...")
-    index = faiss.IndexHNSWFlat(dimension, M)
-    index.hnsw.efConstruction = EF_CONSTRUCTION
-    index.add(skill_vectors)
-
-    # Save the FAISS index to disk
-    index_file = os.path.join(INDEX_DIR, f"{category_name}_hnsw.index")
-    faiss.write_index(index, index_file)
-    print(f"✅ Index saved: {index_file}")
-
-    # Save a mapping from FAISS index IDs to the DataFrame's row indices
-    mapping_file = os.path.join(INDEX_DIR, f"{category_name}_mapping.npy")
-    np.save(mapping_file, df.index.to_numpy())
-    print(f"✅ Mapping saved: {mapping_file}")
+    if target_recall:
+        print(f"⚡ Tuning FAISS index for recall@10 >= {target_recall}...")
+        index, params = tune_index(
+            skill_vectors, lambda m: faiss.IndexHNSWFlat(dimension, m), lambda: faiss.IndexFlatL2(dimension),
+            target_recall=target_recall, queries=queries,
+        )
+        print(f"✅ Chosen parameters: {params}")
+    else:
+        # Create FAISS HNSW index and add the binary vectors
+        print("⚡ Building FAISS HNSW index...")
+        index = faiss.IndexHNSWFlat(dimension, M)
+        index.hnsw.efConstruction = EF_CONSTRUCTION
+        index.add(skill_vectors)
+        params = {'index': 'hnsw', 'M': M, 'efConstruction': EF_CONSTRUCTION, 'efSearch': index.hnsw.efSearch}
+    atomic_write_index(index, index_file)
+    return params
 
 def main():
-    """Main function to process CSV files and build indices."""
-    # List your CSV files here; for example:
-    csv_files = [f for f in os.listdir(CSV_DIR) if f.endswith('_subset.csv')]
-    
-    if not csv_files:
-        print("❌ No CSV files found in the directory.")
+    """Main function to build indices for every category in the skill store."""
+    parser = argparse.ArgumentParser(description="Build per-category job indexes from the skill store.")
+    parser.add_argument('--workers', type=int, default=1, help="Number of build processes")
+    parser.add_argument('--force', action='store_true', help="Rebuild categories whose inputs are unchanged")
+    parser.add_argument('--layout', choices=[BINARY, FLOAT], default=LAYOUT, help="Packed bit codes or float32 HNSW")
+    parser.add_argument('--target-recall', type=float, default=TARGET_RECALL, help="Recall@10 the float index is tuned for")
+    parser.add_argument('--no-tune', action='store_true', help="Use the fixed M / efConstruction for the float index")
+    parser.add_argument('--tuning-queries', default=TUNING_QUERIES_FILE, help="Candidates JSON used as tuning queries")
+    args = parser.parse_args()
+
+    if not os.path.exists(STORE_DIR):
+        print(f"❌ Skill store '{STORE_DIR}' not found. Run skill_store.py first.")
+        return
+
+    open_store(STORE_DIR, args.tuning_queries)
+    categories = store.manifest['categories']
+    if not categories:
+        print("❌ No categories found in the skill store.")
         return
 
-    for csv_file in csv_files:
-        process_csv(csv_file)
+    # Schedule by number of stored skill entries, largest first
+    sizes = {category_name: entry['nnz'] for category_name, entry in categories.items()}
+    target_recall = None if args.no_tune else args.target_recall
+    build = partial(process_category, force=args.force, layout=args.layout, target_recall=target_recall)
+    run_builds(build, sizes, workers=args.workers, initializer=open_store, initargs=(STORE_DIR, args.tuning_queries))
 
 if __name__ == "__main__":
     main()
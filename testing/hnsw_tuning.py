@@ -0,0 +1,129 @@
+import time
+import numpy as np
+import faiss
+
+# Recall@K against brute force that a tuned setting must reach
+TARGET_RECALL = 0.95
+K = 10
+
+# Synthetic tuning queries: each is the normalized sum of QUERY_MIX random
+# vectors, which resembles a candidate profile spanning several jobs far
+# better than a single job vector (that also finds itself)
+TUNING_QUERIES = 200
+QUERY_MIX = 3
+
+# Fewer real queries than this are replaced by synthetic ones
+MIN_QUERIES = 20
+
+# Categories up to this size always use exact flat search
+FLAT_MAX_ROWS = 256
+
+# Settings tried, cheapest first within each build
+M_VALUES = (8, 16, 32)
+EF_CONSTRUCTION_VALUES = (40, 200)
+EF_SEARCH_VALUES = (16, 32, 64, 128, 256)
+
+
+def recall_at_k(vectors, queries, ids, exact_distances):
+    """
+    Share of returned hits at least as close as the exact k-th neighbour.
+    Binary skill vectors have many exact ties, so ids are not compared.
+    """
+    found = vectors[np.maximum(ids, 0)]
+    distances = ((found - queries[:, None, :]) ** 2).sum(axis=2)
+    good = (ids >= 0) & (distances <= exact_distances[:, -1:] + 1e-5)
+    return good.sum(axis=1).mean() / exact_distances.shape[1]
+
+def mixed_queries(vectors, n_queries=TUNING_QUERIES, seed=0):
+    rng = np.random.default_rng(seed)
+    queries = np.zeros((n_queries, vectors.shape[1]), dtype=np.float32)
+    for _ in range(QUERY_MIX):
+        queries += vectors[rng.integers(0, len(vectors), size=n_queries)]
+    faiss.normalize_L2(queries)
+    return queries
+
+def timed_search(index, queries, k, repeats=3):
+    """Search results and the best of `repeats` timings."""
+    seconds = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        _, ids = index.search(queries, k)
+        seconds = min(seconds, time.perf_counter() - start)
+    return ids, seconds
+
+def hnsw_of(index):
+    """The HNSW graph of an index, looking through re-ranking wrappers; None for other indexes."""
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexRefine):
+        index = faiss.downcast_index(index.base_index)
+    return getattr(index, 'hnsw', None)
+
+def apply_search_params(index, params):
+    """Apply tuned search-time parameters (from the build info) to a loaded index."""
+    hnsw = hnsw_of(index)
+    if hnsw is not None and params and 'efSearch' in params:
+        hnsw.efSearch = params['efSearch']
+    return index
+
+
+def tune_index(vectors, make_hnsw, make_flat, target_recall=TARGET_RECALL, k=K, queries=None, seed=0):
+    """
+    Build the cheapest index over `vectors` that meets the target recall.
+
+    `make_hnsw(M)` and `make_flat()` create empty indexes. Tiny categories
+    use flat search. Otherwise every (M, efConstruction) build is searched
+    with increasing efSearch until it reaches the target recall against
+    brute force; the setting with the fastest searches wins, and flat
+    search wins if it is faster still. Real queries (e.g. candidate
+    profiles) are used when at least MIN_QUERIES are given, otherwise
+    synthetic ones from mixed_queries().
+
+    Returns (index, params) where params describe the chosen setting.
+    """
+    n_vectors = len(vectors)
+    flat = make_flat()
+    if not flat.is_trained:
+        flat.train(vectors)
+    flat.add(vectors)
+    if n_vectors <= FLAT_MAX_ROWS:
+        return flat, {'index': 'flat'}
+
+    if queries is None or len(queries) < MIN_QUERIES:
+        queries = mixed_queries(vectors, seed=seed)
+    else:
+        queries = np.ascontiguousarray(queries[:TUNING_QUERIES], dtype=np.float32)
+    k = min(k, n_vectors)
+
+    # Brute force over the unquantized vectors is the reference
+    exact = faiss.IndexFlatL2(vectors.shape[1])
+    exact.add(vectors)
+    exact_distances, _ = exact.search(queries, k)
+
+    # Flat search over quantized vectors is not exact either
+    ids, flat_seconds = timed_search(flat, queries, k)
+    best_index, best_params, best_seconds = flat, {'index': 'flat'}, flat_seconds
+    if recall_at_k(vectors, queries, ids, exact_distances) < target_recall:
+        best_seconds = float('inf')
+
+    for m in M_VALUES:
+        for ef_construction in EF_CONSTRUCTION_VALUES:
+            index = make_hnsw(m)
+            index.hnsw.efConstruction = ef_construction
+            if not index.is_trained:
+                index.train(vectors)
+            index.add(vectors)
+
+            for ef_search in EF_SEARCH_VALUES:
+                index.hnsw.efSearch = ef_search
+                ids, seconds = timed_search(index, queries, k)
+                recall = recall_at_k(vectors, queries, ids, exact_distances)
+                if recall >= target_recall:
+                    if seconds < best_seconds:
+                        best_index, best_seconds = index, seconds
+                        best_params = {
+                            'index': 'hnsw', 'M': m, 'efConstruction': ef_construction,
+                            'efSearch': ef_search, 'recall': round(float(recall), 4),
+                        }
+                    # Larger efSearch only costs more for this build
+                    break
+    return best_index, best_params
@@ -0,0 +1,305 @@
+import os
+import json
+import argparse
+import numpy as np
+import faiss
+from skill_store import SkillStore, category_key, preprocess_text, split_skills
+from parallel_build import atomic_save_npy, atomic_write_index, atomic_write_json
+
+# Directory for incrementally maintained category indexes
+INDEX_DIR = './incremental_indexes'
+
+# FAISS index parameters
+M = 32
+EF_CONSTRUCTION = 200
+
+# Spare dimensions reserved for skills that appear after the index is built.
+# The vector dimension only changes (forcing a rebuild) when they run out.
+GROWTH_FACTOR = 1.5
+MIN_CAPACITY = 64
+
+
+def job_skills(job):
+    """Preprocessed skills of a job record; 'Skills' may be a comma-separated string or a list."""
+    skills = job.get('Skills', job.get('skills', []))
+    if isinstance(skills, str):
+        return split_skills(skills)
+    return [skill for skill in (preprocess_text(skill) for skill in skills) if skill]
+
+def grown_capacity(n_columns):
+    return max(MIN_CAPACITY, int(n_columns * GROWTH_FACTOR))
+
+def has_index(category, index_dir=INDEX_DIR):
+    return os.path.exists(os.path.join(index_dir, f"{category_key(category)}_state.json"))
+
+
+class IncrementalIndex:
+    """
+    HNSW index over binary skill vectors with stable job ids.
+
+    Files per category in `index_dir`:
+    - <category>_incr_<n>.index: IndexIDMap2 over IndexHNSWFlat, keyed by job id
+    - <category>_jobs.jsonl:     one {"id", "title", "skills"} record per job, append-only
+    - <category>_tombstones.npy: ids of expired jobs, excluded at search time
+    - <category>_state.json:     skill columns, dimension capacity, the next free id
+                                 and the generation n of the current index
+
+    New skills take unused dimensions, so stored vectors stay valid as the
+    vocabulary grows. Every save writes the index under a new generation
+    and then replaces the state file, so the index, its columns and next_id
+    change together. Job records beyond next_id come from an interrupted
+    ingest and are ignored.
+    """
+
+    def __init__(self, category, index_dir=INDEX_DIR):
+        self.name = category_key(category)
+        self.index_dir = index_dir
+
+        with open(self.path('state.json'), 'r', encoding='utf-8') as file:
+            state = json.load(file)
+        self.columns = state['columns']
+        self.capacity = state['capacity']
+        self.next_id = state['next_id']
+        self.generation = state['generation']
+        self.column_ids = {skill: i for i, skill in enumerate(self.columns)}
+
+        self.index = faiss.read_index(self.index_path())
+        tombstones_path = self.path('tombstones.npy')
+        self.tombstones = set(np.load(tombstones_path).tolist()) if os.path.exists(tombstones_path) else set()
+
+        self.titles = {record['id']: record['title'] for record in self.read_records()}
+
+    def path(self, suffix):
+        return os.path.join(self.index_dir, f"{self.name}_{suffix}")
+
+    def index_path(self, generation=None):
+        """Index file of a generation, the current one by default."""
+        return self.path(f"incr_{self.generation if generation is None else generation}.index")
+
+    def read_records(self):
+        """
+        Job records below next_id, in file order. Sets records_size to the
+        bytes of complete records; a partial last record comes from an
+        ingest that is still running or was interrupted.
+        """
+        records = []
+        self.records_size = 0
+        with open(self.path('jobs.jsonl'), 'rb') as file:
+            for line in file:
+                if not line.endswith(b'\n'):
+                    break
+                self.records_size += len(line)
+                record = json.loads(line)
+                if record['id'] < self.next_id:
+                    records.append(record)
+        return records
+
+    # --- Building ---
+    @classmethod
+    def create(cls, category, titles, skill_lists, ids=None, index_dir=INDEX_DIR):
+        """Build a new index from job titles and preprocessed skill lists."""
+        os.makedirs(index_dir, exist_ok=True)
+        name = category_key(category)
+        ids = np.arange(len(titles), dtype=np.int64) if ids is None else np.asarray(ids, dtype=np.int64)
+
+        columns = list(dict.fromkeys(skill for skills in skill_lists for skill in skills))
+        capacity = grown_capacity(len(columns))
+        column_ids = {skill: i for i, skill in enumerate(columns)}
+
+        index = faiss.IndexIDMap2(cls.new_hnsw(capacity))
+        vectors = cls.vectorize(skill_lists, column_ids, capacity)
+        index.add_with_ids(vectors, ids)
+
+        with open(os.path.join(index_dir, f"{name}_jobs.jsonl"), 'w', encoding='utf-8') as file:
+            for job_id, title, skills in zip(ids.tolist(), titles, skill_lists):
+                file.write(json.dumps({'id': job_id, 'title': title, 'skills': list(skills)}, ensure_ascii=False) + '\n')
+
+        atomic_write_index(index, os.path.join(index_dir, f"{name}_incr_0.index"))
+        atomic_save_npy(os.path.join(index_dir, f"{name}_tombstones.npy"), np.empty(0, dtype=np.int64))
+        atomic_write_json(os.path.join(index_dir, f"{name}_state.json"), {
+            'columns': columns,
+            'capacity': capacity,
+            'next_id': int(ids.max()) + 1 if len(ids) else 0,
+            'generation': 0,
+        })
+        return cls(category, index_dir)
+
+    @classmethod
+    def from_store(cls, store, category, index_dir=INDEX_DIR):
+        """Bootstrap from the skill store; job ids are the category's row positions."""
+        skills = store.load_category(category)
+        matrix = skills.matrix
+        skill_lists = [
+            [store.vocabulary[skills.columns[column]] for column in matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]]
+            for row in range(matrix.shape[0])
+        ]
+        # Rows without skills cannot be matched, leave them out like graphCreator2
+        rows = [row for row, row_skills in enumerate(skill_lists) if row_skills]
+        return cls.create(
+            category, [str(skills.titles[row]) for row in rows], [skill_lists[row] for row in rows],
+            ids=rows, index_dir=index_dir,
+        )
+
+    @staticmethod
+    def new_hnsw(dimension):
+        index = faiss.IndexHNSWFlat(dimension, M)
+        index.hnsw.efConstruction = EF_CONSTRUCTION
+        return index
+
+    @staticmethod
+    def vectorize(skill_lists, column_ids, dimension):
+        """Binary vectors over the known columns, L2-normalized like graphCreator2."""
+        vectors = np.zeros((len(skill_lists), dimension), dtype=np.float32)
+        for row, skills in enumerate(skill_lists):
+            vectors[row, [column_ids[skill] for skill in skills if skill in column_ids]] = 1
+        faiss.normalize_L2(vectors)
+        return vectors
+
+    # --- Updates ---
+    def add_jobs(self, jobs):
+        """
+        Append job records (dicts with 'Title' and 'Skills') under new ids.
+        Returns the assigned ids.
+        """
+        titles = [job.get('Title', job.get('title', 'N/A')) for job in jobs]
+        skill_lists = [job_skills(job) for job in jobs]
+
+        for skills in skill_lists:
+            for skill in skills:
+                if skill not in self.column_ids:
+                    self.column_ids[skill] = len(self.columns)
+                    self.columns.append(skill)
+
+        ids = np.arange(self.next_id, self.next_id + len(jobs), dtype=np.int64)
+
+        with open(self.path('jobs.jsonl'), 'a', encoding='utf-8') as file:
+            # Drop a partial record left by an interrupted ingest
+            file.truncate(self.records_size)
+            for job_id, title, skills in zip(ids.tolist(), titles, skill_lists):
+                file.write(json.dumps({'id': job_id, 'title': title, 'skills': skills}, ensure_ascii=False) + '\n')
+                self.titles[job_id] = title
+        self.records_size = os.path.getsize(self.path('jobs.jsonl'))
+        self.next_id += len(jobs)
+
+        if len(self.columns) > self.capacity:
+            # Out of spare dimensions: re-add every live job at a larger dimension
+            self.rebuild(grown_capacity(len(self.columns)))
+        else:
+            self.index.add_with_ids(self.vectorize(skill_lists, self.column_ids, self.capacity), ids)
+            self.save()
+        return ids
+
+    def expire(self, ids):
+        """Tombstone jobs so they are no longer returned by search."""
+        self.tombstones.update(int(job_id) for job_id in ids)
+        atomic_save_npy(self.path('tombstones.npy'), np.asarray(sorted(self.tombstones), dtype=np.int64))
+
+    def rebuild(self, capacity=None):
+        """Rebuild the HNSW graph from the job records, dropping tombstoned jobs."""
+        live = {record['id']: record for record in self.read_records() if record['id'] not in self.tombstones}
+
+        self.capacity = capacity or self.capacity
+        self.index = faiss.IndexIDMap2(self.new_hnsw(self.capacity))
+        if live:
+            ids = np.fromiter(live, dtype=np.int64, count=len(live))
+            self.index.add_with_ids(
+                self.vectorize([record['skills'] for record in live.values()], self.column_ids, self.capacity), ids,
+            )
+        # Commit the new index first; until the job records and tombstones
+        # are compacted below, the old ones still describe it correctly
+        self.save()
+
+        tmp_path = f"{self.path('jobs.jsonl')}.tmp-{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            for record in live.values():
+                file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.path('jobs.jsonl'))
+        self.records_size = os.path.getsize(self.path('jobs.jsonl'))
+
+        self.titles = {job_id: record['title'] for job_id, record in live.items()}
+        self.tombstones = set()
+        atomic_save_npy(self.path('tombstones.npy'), np.empty(0, dtype=np.int64))
+
+    def save(self):
+        """
+        Write the index as the next generation and commit it by replacing
+        the state file. A crash before the state is replaced leaves the
+        previous index and state in effect.
+        """
+        previous_path = self.index_path()
+        self.generation += 1
+        atomic_write_index(self.index, self.index_path())
+        atomic_write_json(self.path('state.json'), {
+            'columns': self.columns,
+            'capacity': self.capacity,
+            'next_id': self.next_id,
+            'generation': self.generation,
+        })
+        if os.path.exists(previous_path):
+            os.remove(previous_path)
+
+    # --- Search ---
+    def search(self, skill_lists, k=5):
+        """
+        Search with lists of preprocessed skills.
+        Returns (distances, ids); tombstoned jobs are filtered by an id selector
+        and missing results have id -1.
+        """
+        k = min(k, self.index.ntotal)
+        if k < 1:
+            # FAISS does not accept k=0, e.g. for a category with no jobs yet
+            return np.empty((len(skill_lists), 0), dtype=np.float32), np.empty((len(skill_lists), 0), dtype=np.int64)
+        queries = self.vectorize(skill_lists, self.column_ids, self.capacity)
+        params = None
+        if self.tombstones:
+            # Keep references to the selectors alive for the duration of the search
+            tombstones = faiss.IDSelectorBatch(np.asarray(sorted(self.tombstones), dtype=np.int64))
+            selector = faiss.IDSelectorNot(tombstones)
+            params = faiss.SearchParametersHNSW(sel=selector)
+        return self.index.search(queries, k, params=params)
+
+
+def read_jobs(path):
+    """Read job records from a JSON Lines file or a JSON list."""
+    with open(path, 'r', encoding='utf-8') as file:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in file if line.strip()]
+        return json.load(file)
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain incremental per-category job indexes.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    init_parser = subparsers.add_parser('init', help="Build a category index from the skill store")
+    init_parser.add_argument('category')
+
+    ingest_parser = subparsers.add_parser('ingest', help="Append new job postings to a category")
+    ingest_parser.add_argument('category')
+    ingest_parser.add_argument('jobs', help="JSON or JSON Lines file with Title and Skills per job")
+
+    expire_parser = subparsers.add_parser('expire', help="Tombstone expired job ids")
+    expire_parser.add_argument('category')
+    expire_parser.add_argument('ids', type=int, nargs='+')
+
+    compact_parser = subparsers.add_parser('compact', help="Rebuild a category without its tombstoned jobs")
+    compact_parser.add_argument('category')
+
+    args = parser.parse_args()
+
+    if args.command == 'init':
+        index = IncrementalIndex.from_store(SkillStore(), args.category)
+        print(f"✅ Indexed {index.index.ntotal} jobs for '{args.category}'")
+    elif args.command == 'ingest':
+        index = IncrementalIndex(args.category)
+        ids = index.add_jobs(read_jobs(args.jobs))
+        print(f"✅ Added {len(ids)} jobs to '{args.category}' (ids {ids[0] if len(ids) else '-'}..{ids[-1] if len(ids) else '-'})")
+    elif args.command == 'expire':
+        IncrementalIndex(args.category).expire(args.ids)
+        print(f"✅ Expired {len(args.ids)} jobs in '{args.category}'")
+    elif args.command == 'compact':
+        index = IncrementalIndex(args.category)
+        index.rebuild()
+        print(f"✅ Compacted '{args.category}' to {index.index.ntotal} jobs")
+
+if __name__ == "__main__":
+    main()
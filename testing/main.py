@@ -1,84 +1,146 @@
+import argparse
 import pandas as pd
-import networkx as nx
-from preprocessing import normalize_skills_batch
+import numpy as np
 import faiss
-from sklearn.preprocessing import MultiLabelBinarizer
-
-# Load and preprocess data
-file_path = 'analytics_jobs.csv'
-job_postings_data = pd.read_csv(file_path, encoding='iso-8859-1')
-job_postings_data = job_postings_data.dropna(subset=['Skills'])
-job_postings_data['Skills'] = job_postings_data['Skills'].str.split(',')
-
-# Create unique skills set
-unique_skills = set(skill.strip().lower().replace(' ','') for sublist in job_postings_data['Skills'] for skill in sublist)
-unique_skills = normalize_skills_batch(unique_skills)
-print('total no of columns',len(unique_skills))
-
-# Vectorize skills
-mlb = MultiLabelBinarizer()
-skill_vectors = mlb.fit_transform(job_postings_data['Skills'])
-
-# Create FAISS index
-d = skill_vectors.shape[1]
-M = 32
-index = faiss.IndexHNSWFlat(d, M)
-index.hnsw.efConstruction = 64
-index.hnsw.efSearch = 32
-index.add(skill_vectors.astype('float32'))
-
-# Create a directed graph
-G = nx.DiGraph()
-
-# Add job nodes and their required skills
-for idx, row in job_postings_data.iterrows():
-    job_title = row['Title']
-    G.add_node(job_title, type='job')
-    for skill in row['Skills']:
-        normalized_skills = normalize_skills_batch([skill.strip().lower()])
-        if normalized_skills:
-            normalized_skill = normalized_skills[0]
-            G.add_node(normalized_skill, type='skill')
-            G.add_edge(normalized_skill, job_title, relation='required')
-
-# Function to get job recommendations for a skill
-def get_job_recommendations(skill, k=5):
-    query_skill_vector = mlb.transform([[skill]]).astype('float32')
-    D, I = index.search(query_skill_vector, k)
-    return job_postings_data.iloc[I[0]]['Title'].tolist()
-
-# # Add edges from skills to recommended jobs
-for skill in unique_skills:
-    recommended_jobs = get_job_recommendations(skill)
-    for job in recommended_jobs:
-        G.add_edge(skill, job, relation='recommended')
-
-# Create a list to store all graph data
-graph_data = []
-
-# Add node data
-for node, attributes in G.nodes(data=True):
-    graph_data.append({
-        'source': node,
-        'target': '',
-        'type': attributes['type'],
-        'relation': ''
-    })
+from scipy import sparse
+from preprocessing import explode_skill_column, normalizer
+from hnsw_tuning import tune_index
+
+# Job postings with 'Title' and comma-separated 'Skills' columns
+JOBS_FILE = 'analytics_jobs.csv'
+
+# Graph output; a .parquet extension writes Parquet instead of CSV
+GRAPH_FILE = 'graph_data.csv'
+
+# Recommended jobs per skill
+K = 5
+
+
+def load_jobs(file_path=JOBS_FILE):
+    """Titles and skills cells of the job postings that list skills."""
+    job_postings_data = pd.read_csv(file_path, encoding='iso-8859-1', usecols=['Title', 'Skills'])
+    job_postings_data = job_postings_data.dropna(subset=['Skills']).reset_index(drop=True)
+    return job_postings_data['Title'].to_numpy(dtype=object), job_postings_data['Skills']
+
+def flatten_resolved(skills, resolved, vocabulary):
+    """
+    Flatten the normalized skills of each distinct raw skill into ids of
+    `vocabulary` (a dict, extended in place). Returns (offsets, ids).
+    """
+    lengths = np.fromiter((len(resolved[skill]) for skill in skills), dtype=np.int64, count=len(skills))
+    ids = [vocabulary.setdefault(value, len(vocabulary)) for skill in skills for value in resolved[skill]]
+    return np.concatenate([[0], np.cumsum(lengths)]), np.asarray(ids, dtype=np.int64)
+
+def dedupe_pairs(sources, targets):
+    """Mask of the first occurrence of each (source, target) pair of integer ids."""
+    return ~pd.Series(sources * (int(targets.max(initial=0)) + 1) + targets).duplicated().to_numpy()
+
+
+def build_graph(titles, skills_cells, k=K):
+    """
+    Build the skill -> job graph as NumPy arrays.
+
+    Each distinct raw skill is normalized once. Skills are 'required' by
+    the jobs that list them. Each normalized skill is also searched in one
+    batch as a single-skill query, and linked to its k nearest jobs as
+    'recommended' (replacing a 'required' edge between the same nodes).
+
+    Returns (nodes, edges) DataFrames.
+    """
+    rows, codes, skills = explode_skill_column(skills_cells)
+    resolved = normalizer.resolve(skills)
+    vocabulary = {}
+    offsets, value_ids = flatten_resolved(skills, resolved, vocabulary)
 
-# Add edge data
-for source, target, attributes in G.edges(data=True):
-    graph_data.append({
-        'source': source,
-        'target': target,
-        'type': '',
-        'relation': attributes['relation']
+    lengths = np.diff(offsets)
+
+    # Required edges: the first normalized skill of every listed skill
+    first_ids = np.full(len(skills), -1, dtype=np.int64)
+    first_ids[lengths > 0] = value_ids[offsets[:-1][lengths > 0]]
+    required_skills = first_ids[codes]
+    required_rows = rows[required_skills >= 0]
+    required_skills = required_skills[required_skills >= 0]
+
+    # Job vectors over all normalized skills of their listed skills
+    repeats = lengths[codes]
+    starts = np.repeat(offsets[codes] - np.cumsum(repeats) + repeats, repeats)
+    vector_rows = np.repeat(rows, repeats)
+    vector_columns = value_ids[starts + np.arange(repeats.sum())]
+    skill_vectors = sparse.csr_matrix(
+        (np.ones(len(vector_rows), dtype=np.float32), (vector_rows, vector_columns)),
+        shape=(len(titles), len(vocabulary)),
+    )
+    skill_vectors.data[:] = 1
+    print('total no of columns', len(vocabulary))
+
+    # Create FAISS index with the cheapest parameters that reach the target recall
+    d = len(vocabulary)
+    index, index_params = tune_index(
+        np.ascontiguousarray(skill_vectors.toarray()), lambda m: faiss.IndexHNSWFlat(d, m), lambda: faiss.IndexFlatL2(d),
+    )
+    print('index parameters', index_params)
+
+    # Queries: skills normalized with spaces removed, one-hot over the job vector columns
+    query_skills = list(dict.fromkeys(skill.replace(' ', '') for skill in skills))
+    query_resolved = normalizer.resolve(query_skills)
+    query_names = dict.fromkeys(value for skill in query_skills for value in query_resolved[skill])
+    query_ids = np.asarray([vocabulary[name] for name in query_names if name in vocabulary], dtype=np.int64)
+
+    queries = np.zeros((len(query_ids), d), dtype=np.float32)
+    queries[np.arange(len(query_ids)), query_ids] = 1
+    _, neighbours = index.search(queries, min(k, len(titles))) if len(query_ids) else (None, np.empty((0, k), dtype=np.int64))
+    recommended_skills = np.repeat(query_ids, neighbours.shape[1])
+    recommended_rows = neighbours.ravel()
+    found = recommended_rows >= 0
+    recommended_skills, recommended_rows = recommended_skills[found], recommended_rows[found]
+
+    # Job nodes are titles, so postings sharing a title share a node
+    title_codes, title_names = pd.factorize(pd.Series(titles, dtype=object))
+    skill_names = np.empty(len(vocabulary), dtype=object)
+    skill_names[list(vocabulary.values())] = list(vocabulary)
+
+    sources = np.concatenate([required_skills, recommended_skills])
+    targets = title_codes[np.concatenate([required_rows, recommended_rows])]
+    relations = np.repeat(np.array(['required', 'recommended'], dtype=object), [len(required_skills), len(recommended_skills)])
+
+    # A later edge between the same nodes replaces the earlier one
+    keep = dedupe_pairs(sources[::-1], targets[::-1])[::-1]
+    edges = pd.DataFrame({
+        'source': skill_names[sources[keep]],
+        'target': np.asarray(title_names, dtype=object)[targets[keep]],
+        'relation': relations[keep],
     })
 
-# Convert to DataFrame
-graph_df = pd.DataFrame(graph_data)
+    used_skills = np.unique(sources)
+    nodes = pd.concat([
+        pd.DataFrame({'node': np.asarray(title_names, dtype=object), 'type': 'job'}),
+        pd.DataFrame({'node': skill_names[used_skills], 'type': 'skill'}),
+    ], ignore_index=True).drop_duplicates(subset='node', keep='last')
+    return nodes, edges
+
+def write_graph(nodes, edges, path=GRAPH_FILE):
+    """Write node rows then edge rows in the source/target/type/relation layout."""
+    graph_df = pd.concat([
+        pd.DataFrame({'source': nodes['node'], 'target': '', 'type': nodes['type'], 'relation': ''}),
+        pd.DataFrame({'source': edges['source'], 'target': edges['target'], 'type': '', 'relation': edges['relation']}),
+    ], ignore_index=True)
+    if path.endswith('.parquet'):
+        graph_df.to_parquet(path, index=False)
+    else:
+        graph_df.to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the skill -> job graph of a job postings CSV.")
+    parser.add_argument('--jobs', default=JOBS_FILE)
+    parser.add_argument('--output', default=GRAPH_FILE, help="CSV, or Parquet with a .parquet extension")
+    parser.add_argument('-k', type=int, default=K, help="Recommended jobs per skill")
+    args = parser.parse_args()
 
-# Save to CSV
-csv_path = 'graph_data.csv'
-graph_df.to_csv(csv_path, index=False)
+    titles, skills_cells = load_jobs(args.jobs)
+    nodes, edges = build_graph(titles, skills_cells, args.k)
+    write_graph(nodes, edges, args.output)
+    print(f"Graph data saved to {args.output}: {len(nodes)} nodes, {len(edges)} edges")
 
-print(f"Graph data saved to {csv_path}")
+if __name__ == "__main__":
+    main()
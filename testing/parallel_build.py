@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import hashlib
+import numpy as np
+import faiss
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Status values reported per category
+BUILT = 'built'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+
+
+# --- Fingerprints ---
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def fingerprint(parts, params):
+    """Combine input digests and build parameters into one fingerprint."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(str(part).encode('utf-8'))
+    digest.update(json.dumps(params, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+# --- Atomic Writes ---
+def temporary_path(path):
+    return f"{path}.tmp-{os.getpid()}"
+
+def atomic_write_index(index, path):
+    """Write a FAISS index to a temporary file and move it into place."""
+    tmp_path = temporary_path(path)
+    faiss.write_index(index, tmp_path)
+    os.replace(tmp_path, path)
+
+def atomic_save_npy(path, array):
+    tmp_path = temporary_path(path)
+    with open(tmp_path, 'wb') as file:
+        np.save(file, array)
+    os.replace(tmp_path, path)
+
+def atomic_write_json(path, data):
+    tmp_path = temporary_path(path)
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# --- Incremental Builds ---
+def build_info_path(index_dir, category_name):
+    return os.path.join(index_dir, f"{category_name}_build.json")
+
+def is_up_to_date(index_dir, category_name, build_fingerprint, outputs):
+    """
+    Whether a category was last built from the same inputs.
+    The build info file is written after the outputs, so a crashed build
+    never looks up to date.
+    """
+    info_path = build_info_path(index_dir, category_name)
+    if not os.path.exists(info_path) or not all(os.path.exists(path) for path in outputs):
+        return False
+    with open(info_path, 'r', encoding='utf-8') as file:
+        return json.load(file).get('fingerprint') == build_fingerprint
+
+def record_build(index_dir, category_name, build_fingerprint, **info):
+    atomic_write_json(build_info_path(index_dir, category_name), {'fingerprint': build_fingerprint, **info})
+
+def read_build_info(index_dir, category_name):
+    """The info recorded with a category's last build, or {} if there is none."""
+    info_path = build_info_path(index_dir, category_name)
+    if not os.path.exists(info_path):
+        return {}
+    with open(info_path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+# --- Scheduling ---
+def timed(build, category_name):
+    """Run build(category_name) and return (category_name, status, seconds)."""
+    start = time.perf_counter()
+    try:
+        status = build(category_name)
+    except Exception as e:
+        print(f"❌ Error building {category_name}: {e}")
+        status = FAILED
+    return category_name, status, time.perf_counter() - start
+
+def init_worker(initializer, initargs):
+    # Each worker is one process; keep FAISS from spawning threads on top
+    faiss.omp_set_num_threads(1)
+    if initializer is not None:
+        initializer(*initargs)
+
+def run_builds(build, sizes, workers=1, initializer=None, initargs=()):
+    """
+    Build every category in `sizes` (a dict from category to input size).
+    Largest categories are scheduled first so the pool does not end on one
+    long straggler. With workers > 1 the builds run in a process pool.
+    """
+    order = sorted(sizes, key=sizes.get, reverse=True)
+    start = time.perf_counter()
+
+    results = []
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for category_name in order:
+            results.append(timed(build, category_name))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(initializer, initargs)) as executor:
+            futures = [executor.submit(timed, build, category_name) for category_name in order]
+            for future in as_completed(futures):
+                results.append(future.result())
+
+    report_timings(results, time.perf_counter() - start)
+    return results
+
+def report_timings(results, total_seconds, slowest=20):
+    """Print the slowest builds and a summary per status."""
+    print("\n⏱️ Per-category build times (slowest first):")
+    for category_name, status, seconds in sorted(results, key=lambda result: result[2], reverse=True)[:slowest]:
+        print(f"  {seconds:8.2f}s  {status:<8} {category_name}")
+
+    counts = {}
+    for _, status, _ in results:
+        counts[status] = counts.get(status, 0) + 1
+    summary = ', '.join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"✅ {len(results)} categories in {total_seconds:.2f}s ({summary})")
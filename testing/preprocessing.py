@@ -1,327 +1,479 @@
 import pandas as pd
 import json
-from rapidfuzz import process, fuzz
-from fuzzywuzzy import process, fuzz
 import re
+from collections import OrderedDict
+import numpy as np
+from rapidfuzz import process
+from rapidfuzz.distance import Indel
 from nltk.stem import PorterStemmer
 
 # Skill mapping dictionary
+SKILL_MAPPING = {
+    "redux":"Redux",
+    "ux":"UI and UX",
+    "fastapi":"FastAPI",
+    # Programming Languages
+    "js": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "pyspark": "PySpark",
+    "python":"python",
+    "javascript":"javascript",
+    "java": "java",
+    "c++": "c++",
+    "c#": "c#",
+    "php": "php",
+    "ruby": "ruby",
+    "go": "go",
+    "swift": "swift",
+    "kotlin": "kotlin",
+    "r": "r",
+    "scala": "scala",
+    "perl": "perl",
+    "rust": "rust",
+    "dart": "dart",
+
+    # Web Development
+    "frontend":"Front end development",
+    "frontenddeveloper":"Front end development",
+    "frontenddevelopment":"Front end development",
+    "Front end development":"Front end development",
+    "fullstack":"full stack web development",
+    "fullstackdevelopment":"full stack web development",
+    "webtechnologies": "full stack web development",
+    "webdevelopment": "full stack web development",
+    "mern":"Mern stack development",
+    "mernstack":"Mern stack development",
+    "javafullstack":"Java Full Stack",
+    "pythonfullstack":"Python full stack",
+    "fullstackjava":"Java Full Stack",
+    "fullstackpython":"Python full stack",
+
+    "html": "html",
+    "css": "css",
+    "sass": "sass",
+    "less": "less",
+    "react": "react.js",
+    "react.js":"react.js",
+    "next":"next.js",
+    "nextjs":"next.js",
+    "angular": "angular",
+    "vue": "vue.js",
+    "vue.js":"vue.js",
+    "node": "node.js",
+    "node.js":"node.js",
+    "express": "express.js",
+    "express.js":"express.js",
+    "django": "django",
+    "flask": "flask",
+    "laravel": "laravel",
+    "spring": "spring framework",
+    "sprintboot":"spring framework",
+    "asp.net": "asp.net",
+    "blockchain":"Block chain",
+    "datawarehousing":"Data Warehousing",
+    "snowflake":"snowflake",
+    "sitereliabilityengineering":"Site Reliability Engineering",
+    "sre":"Site Reliability Engineering",
+    "agile": "Agile",
+    "testcases": "Test cases",
+    # Databases
+    "sql": "sql",
+    "sqlqueries":"SQL",
+    "structuredquerylanguage":"sql",
+    "nosql": "nosql",
+    "mysql": "mysql",
+    "postgresql": "postgresql",
+    "mongodb": "mongodb",
+    "redis": "redis",
+    "cassandra": "cassandra",
+    "oracle": "oracle database",
+    "sqlite": "sqlite",
+    "firebase": "firebase",
+    "dynamodb": "amazon dynamodb",
+
+    # Cloud & DevOps
+    "cloudsecurity":"Cloud Security",
+    "cloudprotection":"Cloud Security",
+    "aws": "amazon web services",
+    "amazon web services":"amazon web services",
+    "gcp": "google cloud platform",
+    "google cloud platform":"google cloud platform",
+    "azure": "microsoft azure",
+    "microsoft azure":"microsoft azure",
+    "docker": "docker",
+    "kubernetes": "kubernetes",
+    "terraform": "terraform",
+    "ansible": "ansible",
+    "jenkins": "jenkins",
+    "ci/cd": "continuous integration/deployment",
+    "continuous integration/deployment":"continuous integration/deployment",
+    "git": "git",
+    "github": "github",
+    "gitlab": "gitlab",
+    "bitbucket": "bitbucket",
+    "vs":"Visual Studio Code",
+    "vscode":"Visual Studio Code",
+    
 
-
-def read_json_file(filename):
-    # Load the JSON file into a pandas DataFrame
-    with open(filename, 'r') as file:
-        return json.load(file)
-
-stemmer = PorterStemmer()
+    # Data Science & Machine Learning
+    "analytics":"Analytics",
+    "bimanager": "BI Manager",
+    "businessintelligencemanager":"BI Manager",
+    "businessintelligencearchitect":"BI Architect",
+    "biarchitect":"BI Architect",
+    "bi":"Business intelligence developer",
+    "businessintelligence":"Business intelligence developer",
+    "databricks":"Data Bricks",
+    "googleanlaytics":"Data analysis",
+    "dataanalysis":"Data analysis",
+    "visualanalytics":"Data analysis",
+    "visualizingdata":"Data visualization",
+    "datavisualization":"Data visualization",
+    "datavalidation":"Data validation",
+    "ml": "machine learning",
+    "machine learning":"machine learning",
+    "dl": "deep learning",
+    "deep learning":"deep learning",
+    "ai": "artificial intelligence",
+    "artificial intelligence":"artificial intelligence",
+    "nlp": "natural language processing",
+    "processautomation": "Process automation",
+    "naturallanguageprocessing":"natural language processing",
+    "cv": "computer vision",
+    "opencv":"computer vision",
+    "computervision": "computer vision",
+    "tensorflow": "tensorflow",
+    "pytorch": "pytorch",
+    "keras": "keras",
+    "pandas": "pandas",
+    "numpy": "numpy",
+    "pycharm":"pycharm integraded environment",
+    "jupyter":"jupyter notebook IDE",
+    "excel":"MicroSoft Excel",
+    "scipy": "scipy",
+    "jira": "JIRA",
+    "projectdelivery": "Project delivery",
+    "projectmanagement": "Project management",
+    "billing": "Billing",
+"financialservices": "Financial services",
+    "timeseriesanalysis": "Time series analysis",
+    "crm": "CRM (Customer Relationship Management)",
+"analyticalskills": "Analytics",
+"translation": "Translation",
+    "scikitlearn": "scikitlearn",
+    "apachekafka":"Apache Kafka",
+    "kafka":"Apache Kafka",
+    "spark": "apache spark",
+    "apache spark":"apache spark",
+    "hadoop": "apache hadoop",
+    "apache hadoop":"apache hadoop",
+    "tableau": "tableau",
+    "powerbi": "power bi",
+    "powerpoint":"MS PowerPoint Presentation",
+    "mspowerpoint":"MS PowerPoint Presentation",
+    "msppt":"MS PowerPoint Presentation",
+    "seaborn":"seaborn",
+    "matplotlib":"matplotlib",
+
+    # Networking & Security
+    "vpn": "virtual private network",
+    "dns": "domain name system",
+    "http": "hypertext transfer protocol",
+    "https": "http secure",
+    "ssl": "secure sockets layer",
+    "tls": "transport layer security",
+    "ssh": "secure shell",
+    "ftp": "file transfer protocol",
+    "tcp/ip": "transmission control protocol/internet protocol",
+    "firewall": "firewall",
+    "pen testing": "penetration testing",
+    "testing":"testing",
+    "alteryx":"Alteryx",
+    "communicationskills":"Communication Skills",
+    "problemsolving":"Problem Solving",
+    # Other Common Abbreviations
+    "api": "application programming interface",
+    "rest": "representational state transfer",
+    "graphql": "graphql",
+    "json": "javascript object notation",
+    "xml": "extensible markup language",
+    "yaml": "yaml ain't markup language",
+    "cli": "command line interface",
+    "gui": "UI and UX",
+    "ui":"UI and UX",
+    "uiux":"UI and UX",
+    "ide": "integrated development environment",
+    "sdk": "Software development",
+    "softwaredevelopment":"Software development",
+    "softwareengineering":"Software development",
+    "oop": "object-oriented programming",
+    "fp": "functional programming",
+    "tdd": "test-driven development",
+    "bdd": "behavior-driven development",
+
+    #marketing
+    "marketing":"Marketing",
+    "sales":"Sales",
+    "ethicalhacking": "Ethical Hacking",
+    "cybersecurity": "Cybersecurity",
+    "operations":"Operations",
+    "ops":"Operations",
+    
+    # Databases
+    "mysql": "MySQL",
+    "postgresql": "PostgreSQL",
+    "mongodb": "MongoDB",
+    "redis": "Redis",
+    "oracledatabase": "Oracle Database",
+    "sqlite": "SQLite",
+    "dynamodb": "DynamoDB",
+    
+    # Special Cases (Your Examples)
+    "c": "c",
+    "cplusplus": "c++", 
+    "csarp": "c#",
+    "dotnet": ".NET",
+    "springboot": "Spring Boot",
+    "graphql": "GraphQL",
+    "restapi": "REST API",
+    "oop": "OOP",
+    "fpmodeling": "FP Modeling",
+    "microsoftoffice":"Microsoft Office",
+    "msoffice":"Microsoft Office",
+
+    "googlecolab": "Google Colab",
+    "rprogramming": "R Programming",
+    "dsa": "Data Structures & Algorithms",
+    "datastructures": "Data structures & Algorithms",
+    "devops": "DevOps",
+    "bigdata": "Big Data",
+    "etl": "ETL",
+    "digitalmarketing": "Digital Marketing",
+    "seo": "SEO",
+    "sap": "SAP",
+    "erp": "ERP",
+    "recruitment": "Recruitment",
+    "simon": "SIMON",
+"saas": "SaaS",
+"financialreporting": "Financial reporting",
+"industrialproducts": "Industrial products",
+"accounting": "Accounting",
+"forecasting": "Forecasting",
+"teamwork": "Teamwork",
+"technicalsupport": "Technical support",
+"medicine": "Medicine",
+"userstories":"User stories",
+
+}
 
 # Stop words to be removed
+STOP_WORDS = {"a", "and", "the", "in", "on", "of", "for", "to", "with", "as", "by", "an", "be", "it", "at", 
+              "basics", "developer", "programmer","programming", "development", "engineer", "using", "skills"}
 
+# Fuzzy matches must score above this (scores are rounded to integers first)
+MATCH_THRESHOLD = 80
 
-def normalize_skills_batch(skills):
-    skill_mapping = {
-        "redux":"Redux",
-        "ux":"UI and UX",
-        "fastapi":"FastAPI",
-        # Programming Languages
-        "js": "javascript",
-        "ts": "typescript",
-        "py": "python",
-        "pyspark": "PySpark",
-        "python":"python",
-        "javascript":"javascript",
-        "java": "java",
-        "c++": "c++",
-        "c#": "c#",
-        "php": "php",
-        "ruby": "ruby",
-        "go": "go",
-        "swift": "swift",
-        "kotlin": "kotlin",
-        "r": "r",
-        "scala": "scala",
-        "perl": "perl",
-        "rust": "rust",
-        "dart": "dart",
-
-        # Web Development
-        "frontend":"Front end development",
-        "frontenddeveloper":"Front end development",
-        "frontenddevelopment":"Front end development",
-        "Front end development":"Front end development",
-        "fullstack":"full stack web development",
-        "fullstackdevelopment":"full stack web development",
-        "webtechnologies": "full stack web development",
-        "webdevelopment": "full stack web development",
-        "mern":"Mern stack development",
-        "mernstack":"Mern stack development",
-        "javafullstack":"Java Full Stack",
-        "pythonfullstack":"Python full stack",
-        "fullstackjava":"Java Full Stack",
-        "fullstackpython":"Python full stack",
-
-        "html": "html",
-        "css": "css",
-        "sass": "sass",
-        "less": "less",
-        "react": "react.js",
-        "react.js":"react.js",
-        "next":"next.js",
-        "nextjs":"next.js",
-        "angular": "angular",
-        "vue": "vue.js",
-        "vue.js":"vue.js",
-        "node": "node.js",
-        "node.js":"node.js",
-        "express": "express.js",
-        "express.js":"express.js",
-        "django": "django",
-        "flask": "flask",
-        "laravel": "laravel",
-        "spring": "spring framework",
-        "sprintboot":"spring framework",
-        "asp.net": "asp.net",
-        "blockchain":"Block chain",
-        "datawarehousing":"Data Warehousing",
-        "snowflake":"snowflake",
-        "sitereliabilityengineering":"Site Reliability Engineering",
-        "sre":"Site Reliability Engineering",
-        "agile": "Agile",
-        "testcases": "Test cases",
-        # Databases
-        "sql": "sql",
-        "sqlqueries":"SQL",
-        "structuredquerylanguage":"sql",
-        "nosql": "nosql",
-        "mysql": "mysql",
-        "postgresql": "postgresql",
-        "mongodb": "mongodb",
-        "redis": "redis",
-        "cassandra": "cassandra",
-        "oracle": "oracle database",
-        "sqlite": "sqlite",
-        "firebase": "firebase",
-        "dynamodb": "amazon dynamodb",
-
-        # Cloud & DevOps
-        "cloudsecurity":"Cloud Security",
-        "cloudprotection":"Cloud Security",
-        "aws": "amazon web services",
-        "amazon web services":"amazon web services",
-        "gcp": "google cloud platform",
-        "google cloud platform":"google cloud platform",
-        "azure": "microsoft azure",
-        "microsoft azure":"microsoft azure",
-        "docker": "docker",
-        "kubernetes": "kubernetes",
-        "terraform": "terraform",
-        "ansible": "ansible",
-        "jenkins": "jenkins",
-        "ci/cd": "continuous integration/deployment",
-        "continuous integration/deployment":"continuous integration/deployment",
-        "git": "git",
-        "github": "github",
-        "gitlab": "gitlab",
-        "bitbucket": "bitbucket",
-        "vs":"Visual Studio Code",
-        "vscode":"Visual Studio Code",
-        
-
-        # Data Science & Machine Learning
-        "analytics":"Analytics",
-        "bimanager": "BI Manager",
-        "businessintelligencemanager":"BI Manager",
-        "businessintelligencearchitect":"BI Architect",
-        "biarchitect":"BI Architect",
-        "bi":"Business intelligence developer",
-        "businessintelligence":"Business intelligence developer",
-        "databricks":"Data Bricks",
-        "googleanlaytics":"Data analysis",
-        "dataanalysis":"Data analysis",
-        "visualanalytics":"Data analysis",
-        "visualizingdata":"Data visualization",
-        "datavisualization":"Data visualization",
-        "datavalidation":"Data validation",
-        "ml": "machine learning",
-        "machine learning":"machine learning",
-        "dl": "deep learning",
-        "deep learning":"deep learning",
-        "ai": "artificial intelligence",
-        "artificial intelligence":"artificial intelligence",
-        "nlp": "natural language processing",
-        "processautomation": "Process automation",
-        "naturallanguageprocessing":"natural language processing",
-        "cv": "computer vision",
-        "opencv":"computer vision",
-        "computervision": "computer vision",
-        "tensorflow": "tensorflow",
-        "pytorch": "pytorch",
-        "keras": "keras",
-        "pandas": "pandas",
-        "numpy": "numpy",
-        "pycharm":"pycharm integraded environment",
-        "jupyter":"jupyter notebook IDE",
-        "excel":"MicroSoft Excel",
-        "scipy": "scipy",
-        "jira": "JIRA",
-        "projectdelivery": "Project delivery",
-        "projectmanagement": "Project management",
-        "billing": "Billing",
-    "financialservices": "Financial services",
-        "timeseriesanalysis": "Time series analysis",
-        "crm": "CRM (Customer Relationship Management)",
-    "analyticalskills": "Analytics",
-    "translation": "Translation",
-        "scikitlearn": "scikitlearn",
-        "apachekafka":"Apache Kafka",
-        "kafka":"Apache Kafka",
-        "spark": "apache spark",
-        "apache spark":"apache spark",
-        "hadoop": "apache hadoop",
-        "apache hadoop":"apache hadoop",
-        "tableau": "tableau",
-        "powerbi": "power bi",
-        "powerpoint":"MS PowerPoint Presentation",
-        "mspowerpoint":"MS PowerPoint Presentation",
-        "msppt":"MS PowerPoint Presentation",
-        "seaborn":"seaborn",
-        "matplotlib":"matplotlib",
-
-        # Networking & Security
-        "vpn": "virtual private network",
-        "dns": "domain name system",
-        "http": "hypertext transfer protocol",
-        "https": "http secure",
-        "ssl": "secure sockets layer",
-        "tls": "transport layer security",
-        "ssh": "secure shell",
-        "ftp": "file transfer protocol",
-        "tcp/ip": "transmission control protocol/internet protocol",
-        "firewall": "firewall",
-        "pen testing": "penetration testing",
-        "testing":"testing",
-        "alteryx":"Alteryx",
-        "communicationskills":"Communication Skills",
-        "problemsolving":"Problem Solving",
-        # Other Common Abbreviations
-        "api": "application programming interface",
-        "rest": "representational state transfer",
-        "graphql": "graphql",
-        "json": "javascript object notation",
-        "xml": "extensible markup language",
-        "yaml": "yaml ain't markup language",
-        "cli": "command line interface",
-        "gui": "UI and UX",
-        "ui":"UI and UX",
-        "uiux":"UI and UX",
-        "ide": "integrated development environment",
-        "sdk": "Software development",
-        "softwaredevelopment":"Software development",
-        "softwareengineering":"Software development",
-        "oop": "object-oriented programming",
-        "fp": "functional programming",
-        "tdd": "test-driven development",
-        "bdd": "behavior-driven development",
-
-        #marketing
-        "marketing":"Marketing",
-        "sales":"Sales",
-        "ethicalhacking": "Ethical Hacking",
-        "cybersecurity": "Cybersecurity",
-        "operations":"Operations",
-        "ops":"Operations",
-        
-        # Databases
-        "mysql": "MySQL",
-        "postgresql": "PostgreSQL",
-        "mongodb": "MongoDB",
-        "redis": "Redis",
-        "oracledatabase": "Oracle Database",
-        "sqlite": "SQLite",
-        "dynamodb": "DynamoDB",
-        
-        # Special Cases (Your Examples)
-        "c": "c",
-        "cplusplus": "c++", 
-        "csarp": "c#",
-        "dotnet": ".NET",
-        "springboot": "Spring Boot",
-        "graphql": "GraphQL",
-        "restapi": "REST API",
-        "oop": "OOP",
-        "fpmodeling": "FP Modeling",
-        "microsoftoffice":"Microsoft Office",
-        "msoffice":"Microsoft Office",
-
-        "googlecolab": "Google Colab",
-        "rprogramming": "R Programming",
-        "dsa": "Data Structures & Algorithms",
-        "datastructures": "Data structures & Algorithms",
-        "devops": "DevOps",
-        "bigdata": "Big Data",
-        "etl": "ETL",
-        "digitalmarketing": "Digital Marketing",
-        "seo": "SEO",
-        "sap": "SAP",
-        "erp": "ERP",
-        "recruitment": "Recruitment",
-        "simon": "SIMON",
-    "saas": "SaaS",
-    "financialreporting": "Financial reporting",
-    "industrialproducts": "Industrial products",
-    "accounting": "Accounting",
-    "forecasting": "Forecasting",
-    "teamwork": "Teamwork",
-    "technicalsupport": "Technical support",
-    "medicine": "Medicine",
-    "userstories":"User stories",
-
-    }
-    normalized_skills = []
-    
-    # Stop words to be removed
-    stop_words = {"a", "and", "the", "in", "on", "of", "for", "to", "with", "as", "by", "an", "be", "it", "at", 
-                  "basics", "developer", "programmer","programming", "development", "engineer", "using", "skills"}
+# Maximum number of raw skill strings kept in the normalizer's LRU cache
+CACHE_SIZE = 200000
+
+# Number of queries scored per rapidfuzz cdist call
+CDIST_CHUNK_SIZE = 4096
 
-    for skill in skills:
-        # Step 1: Lowercase and strip extra spaces
-        skill = skill.lower().strip()
+SEPARATORS = re.compile(r"[&/,\-:.\s]+")
+NON_ALPHANUMERIC = re.compile(r"(?ui)\W")
 
-        # Step 2: Replace special characters (&, /, -, ., :, ,) with spaces
-        skill = re.sub(r"[&/,\-:.\s]+", " ", skill).strip()
 
-        # Step 3: Remove spaces between words and check for fuzzy match
-        temp = skill.split()
-        skill = [x for x in temp if x not in stop_words]
-        skill = " ".join(skill)
-        no_space_skill = skill.replace(" ", "")  # Remove all spaces to create a single string
+def read_json_file(filename):
+    # Load the JSON file into a pandas DataFrame
+    with open(filename, 'r') as file:
+        return json.load(file)
 
-        # Perform fuzzy matching on the whole string without spaces
-        best_match, score = process.extractOne(no_space_skill, skill_mapping.keys(), scorer=fuzz.ratio)[:2]
+stemmer = PorterStemmer()
 
-        if score > 80:  # Threshold for good match
-            normalized_skills.append(skill_mapping[best_match])  # Add normalized match
-        else:
-            # Step 4: Tokenize the skill and remove stop words
-            tokens = [token for token in skill.split()]
 
-            # Step 5: Normalize each token using fuzzy matching
-            normalized_tokens = []
-            for token in tokens:
-                # Use fuzzy matching to find the best match for each token
-                best_match, score = process.extractOne(token, skill_mapping.keys(), scorer=fuzz.ratio)[:2]
+def full_process(text):
+    """
+    Replace non-alphanumerics with spaces, lowercase and strip.
+    This is the processor fuzzy matching applies to both queries and keys.
+    """
+    return NON_ALPHANUMERIC.sub(" ", text).lower().strip()
+
+def clean_skill(skill):
+    """Lowercase a skill, replace separators with spaces and drop stop words."""
+    # Step 1: Lowercase and strip extra spaces
+    skill = skill.lower().strip()
+
+    # Step 2: Replace special characters (&, /, -, ., :, ,) with spaces
+    skill = SEPARATORS.sub(" ", skill).strip()
+
+    # Step 3: Remove stop words
+    return " ".join(x for x in skill.split() if x not in STOP_WORDS)
+
+
+class SkillNormalizer:
+    """
+    Maps raw skill strings onto SKILL_MAPPING values.
+
+    The mapping keys are processed once. Queries that equal a processed key
+    take an exact-match fast path, the rest are scored in batches with
+    rapidfuzz cdist, and results per raw skill are kept in a bounded LRU cache.
+    """
+
+    def __init__(self, skill_mapping=SKILL_MAPPING, threshold=MATCH_THRESHOLD, cache_size=CACHE_SIZE):
+        self.keys = [full_process(key) for key in skill_mapping]
+        self.values = list(skill_mapping.values())
+        self.threshold = threshold
+        self.cache_size = cache_size
+
+        # First key wins on ties, so keep the first index per processed key
+        self.exact = {}
+        for i, key in enumerate(self.keys):
+            self.exact.setdefault(key, i)
+
+        self.cache = OrderedDict()
+
+    def match(self, queries):
+        """
+        Fuzzy match queries against the mapping keys.
+        Returns a dict from each query to its mapped value, or None when the
+        best score does not exceed the threshold.
+        """
+        matches = {}
+        pending = []
+        for query in set(queries):
+            processed = full_process(query)
+            if processed in self.exact:
+                matches[query] = self.values[self.exact[processed]]
+            elif not processed:
+                # An empty query scores 0 against every key
+                matches[query] = None
+            else:
+                pending.append((query, processed))
+
+        for start in range(0, len(pending), CDIST_CHUNK_SIZE):
+            chunk = pending[start:start + CDIST_CHUNK_SIZE]
+            scores = process.cdist(
+                [processed for _, processed in chunk], self.keys,
+                scorer=Indel.normalized_similarity, dtype=np.float64,
+            )
+            scores = np.rint(scores * 100)
+            best = scores.argmax(axis=1)
+            best_scores = scores[np.arange(len(chunk)), best]
+            for (query, _), key_index, score in zip(chunk, best, best_scores):
+                matches[query] = self.values[key_index] if score > self.threshold else None
+
+        return matches
+
+    def resolve(self, skills):
+        """Return a dict from each raw skill to its tuple of normalized skills."""
+        resolved = {}
+        missing = []
+        for skill in set(skills):
+            if skill in self.cache:
+                self.cache.move_to_end(skill)
+                resolved[skill] = self.cache[skill]
+            else:
+                missing.append(skill)
+
+        if not missing:
+            return resolved
+
+        cleaned = {skill: clean_skill(skill) for skill in missing}
+
+        # Match the whole skill with spaces removed first
+        whole_matches = self.match(text.replace(" ", "") for text in cleaned.values())
+
+        # Fall back to matching each token of the skills that missed
+        tokens = {
+            token
+            for text in cleaned.values() if whole_matches[text.replace(" ", "")] is None
+            for token in text.split()
+        }
+        token_matches = self.match(tokens)
+
+        for skill, text in cleaned.items():
+            whole_match = whole_matches[text.replace(" ", "")]
+            if whole_match is not None:
+                normalized = (whole_match,)
+            else:
+                normalized = tuple(token_matches[token] for token in text.split() if token_matches[token] is not None)
+            resolved[skill] = normalized
+            self.cache[skill] = normalized
+
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+        return resolved
+
+    def normalize_many(self, skill_lists):
+        """Normalize several skill lists with one batched lookup."""
+        skill_lists = [list(skills) for skills in skill_lists]
+        resolved = self.resolve(skill for skills in skill_lists for skill in skills)
+
+        normalized_lists = []
+        for skills in skill_lists:
+            normalized_skills = [normalized for skill in skills for normalized in resolved[skill]]
+            # Remove duplicates while preserving order
+            normalized_lists.append(list(dict.fromkeys(normalized_skills)))
+        return normalized_lists
+
+    def normalize(self, skills):
+        """Normalize a single list of skills."""
+        return self.normalize_many([skills])[0]
+
+
+normalizer = SkillNormalizer()
 
-                if score > 80:  # Threshold for fuzzy match
-                    normalized_tokens.append(skill_mapping[best_match])  # Map to normalized skill
-   # Keep original token if no match
 
-            # Step 6: Add the normalized tokens to the final list, ensuring uniqueness
-            normalized_skills.extend(normalized_tokens)
+def normalize_skills_batch(skills):
+    return normalizer.normalize(skills)
+
+def normalize_skills_many(skill_lists):
+    return normalizer.normalize_many(skill_lists)
+
+def explode_skill_column(texts):
+    """
+    Split a column of comma-separated skills cells into stripped, lowercased
+    skills, stripping and lowercasing each distinct raw skill once.
+    Returns (rows, codes, skills): the row position and distinct-skill code
+    of every skill occurrence, in row order, and the distinct skills.
+    """
+    texts = pd.Series(texts, dtype=object)
+    texts = texts.where(texts.map(lambda text: isinstance(text, str)), '')
+    counts = np.fromiter((text.count(',') + 1 for text in texts), dtype=np.int64, count=len(texts))
+    rows = np.repeat(np.arange(len(texts), dtype=np.int64), counts)
+
+    raw_codes, raw_skills = pd.factorize(pd.Series(','.join(texts).split(','), dtype=object))
+    codes, skills = pd.factorize(pd.Series(raw_skills, dtype=object).str.strip().str.lower())
+    return rows, codes[raw_codes], np.asarray(skills, dtype=object)
+
+def normalize_skill_column(texts):
+    """
+    Split a column of comma-separated skills cells, strip and lowercase each
+    skill and normalize every row, like normalize_skills_many over the
+    split cells. Each distinct raw skill is resolved once and its
+    normalized skills are mapped back to the rows through factorized codes.
+    """
+    rows, codes, skills = explode_skill_column(texts)
+    resolved = normalizer.resolve(skills)
+
+    # Normalized skills of each distinct raw skill, flattened with offsets
+    lengths = np.fromiter((len(resolved[skill]) for skill in skills), dtype=np.int64, count=len(skills))
+    value_codes, values = pd.factorize(pd.Series([value for skill in skills for value in resolved[skill]], dtype=object))
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+    # Expand every raw skill occurrence into its normalized skills
+    repeats = lengths[codes]
+    starts = np.repeat(offsets[codes] - np.cumsum(repeats) + repeats, repeats)
+    value_ids = value_codes[starts + np.arange(repeats.sum())]
+    rows = np.repeat(rows, repeats)
 
     # Remove duplicates while preserving order
-    normalized_skills = list(dict.fromkeys(normalized_skills))
-
-    return normalized_skills
+    first = ~pd.Series(rows * max(len(values), 1) + value_ids).duplicated().to_numpy()
+    names = np.asarray(values, dtype=object)[value_ids[first]].tolist()
+    bounds = np.searchsorted(rows[first], np.arange(len(texts) + 1)).tolist()
+    return [names[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
 # # Load JSON data
 # data = read_json_file("extracted_skills.json")
 
@@ -348,4 +500,4 @@ def normalize_skills_batch(skills):
 # normalized_skills = normalize_skills_batch(skills_to_normalize, skill_mapping)
 
 # # Print the results
-# print(normalized_skills)
\ No newline at end of file
+# print(normalized_skills)
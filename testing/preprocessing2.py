@@ -1,28 +1,89 @@
+from functools import lru_cache
+import numpy as np
 import spacy
-def preprocess(subset_skills,candidate_skills):
-    nlp = spacy.load("en_core_web_md")
-    hash={}
-
-    for x in subset_skills:
-        x=x.lower()
-        if x[0] in hash:
-            hash[x[0]]+=[x]
-        else:
-            hash[x[0]]=[x]
-
-    print(hash)
-
-    def find_closest_match(text, skills):
-        text_vec = nlp(text)
-        skills_vec = list(nlp.pipe(skills))  # Process all skills at once
-        best_match = max(skills_vec, key=lambda opt: text_vec.similarity(opt))
-        return best_match.text  # Return the matched text
-
-    final=[]
-    for x in candidate_skills:
-        x=x.lower()
-        if(x[0] in hash):
-            final.append(find_closest_match(x, hash[x[0]]))
-        else:
-            continue
-    return final
+from embedding_cache import CACHE_DIR, EmbeddingCache
+
+# spaCy model whose word vectors are compared
+MODEL_NAME = "en_core_web_md"
+
+# Doc vectors are averaged word vectors, so no trained component is run
+EXCLUDED_COMPONENTS = ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer", "ner"]
+
+# Candidate skills whose best similarity is not above this are dropped;
+# skills without known words have no vector and score 0 against everything
+MIN_SIMILARITY = 0.0
+
+
+@lru_cache(maxsize=None)
+def load_nlp(model_name=MODEL_NAME):
+    """Load the spaCy model once per process."""
+    return spacy.load(model_name, exclude=EXCLUDED_COMPONENTS)
+
+
+class SpacyEncoder:
+    """spaCy doc vectors behind the encode() interface EmbeddingCache expects."""
+
+    def __init__(self, nlp):
+        self.nlp = nlp
+
+    @property
+    def dimension(self):
+        return self.nlp.vocab.vectors_length
+
+    def encode(self, texts, batch_size=None, convert_to_numpy=True, show_progress_bar=False):
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vectors[row] = self.nlp.make_doc(text).vector
+        return vectors
+
+
+def skill_text(skill):
+    """
+    Text a skill is encoded as. Only lowercased: preprocess_text would strip
+    punctuation and turn 'c++', 'c#' and 'c' into the same text.
+    """
+    return skill.lower()
+
+def normalize_rows(vectors):
+    """Scale rows to unit length, leaving all-zero rows at zero, so dot products are cosine similarities."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class SemanticSkillMatcher:
+    """
+    Resolves candidate skills to the closest subset skill by word-vector
+    cosine similarity, the same score as spaCy's Doc.similarity.
+
+    The subset vocabulary is encoded once into a normalized matrix, with
+    the vectors cached on disk by EmbeddingCache, so later matchers over
+    the same skills only read them back. Every candidate skill is compared
+    with the whole vocabulary in one matrix multiply.
+    """
+
+    def __init__(self, subset_skills, model_name=MODEL_NAME, cache_dir=CACHE_DIR):
+        self.encoder = SpacyEncoder(load_nlp(model_name))
+        self.skills = list(dict.fromkeys(skill_text(skill) for skill in subset_skills))
+
+        cache = EmbeddingCache(f"spacy_{model_name}", self.encoder.dimension, cache_dir, normalize=skill_text)
+        cache.update(self.skills, self.encoder)
+        self.matrix = normalize_rows(cache.lookup(self.skills))
+
+    def similarities(self, candidate_skills):
+        """(n_candidates x n_skills) cosine similarities."""
+        texts = [skill_text(skill) for skill in candidate_skills]
+        return normalize_rows(self.encoder.encode(texts)) @ self.matrix.T
+
+    def match(self, candidate_skills, min_similarity=MIN_SIMILARITY):
+        """The closest subset skill of each candidate skill, leaving out those with no match."""
+        if not self.skills or not candidate_skills:
+            return []
+        scores = self.similarities(candidate_skills)
+        best = scores.argmax(axis=1)
+        found = scores[np.arange(len(best)), best] > min_similarity
+        return [self.skills[i] for i in best[found]]
+
+
+def preprocess(subset_skills, candidate_skills):
+    """Map candidate skills onto the closest subset skills."""
+    return SemanticSkillMatcher(subset_skills).match(candidate_skills)
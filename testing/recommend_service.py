@@ -0,0 +1,153 @@
+import json
+import time
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+from category_index import CategoryCache, FANOUT_WORKERS, INCREMENTAL_INDEX_DIR, INDEX_DIR, MEMORY_BUDGET, SHARD_TIMEOUT, search_categories
+from skill_store import STORE_DIR
+
+# Default address of the local recommendation service
+HOST = '127.0.0.1'
+PORT = 8765
+
+# Recommendations per request when k is not given, and the most allowed
+DEFAULT_K = 5
+MAX_K = 100
+
+
+def parse_k(value):
+    """Validate k from a query string or a JSON body; raises ValueError unless it is an integer in 1..MAX_K."""
+    # bool is an int subclass, and floats would be truncated silently
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"'k' must be an integer, got {json.dumps(value)}")
+    try:
+        k = int(value)
+    except ValueError:
+        raise ValueError(f"'k' must be an integer, got '{value}'") from None
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"'k' must be between 1 and {MAX_K}, got {k}")
+    return k
+
+def parse_strings(value, name):
+    """Validate a list of strings from a JSON body; raises ValueError otherwise."""
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"'{name}' must be a list of strings")
+    return value
+
+
+class RecommendationHandler(BaseHTTPRequestHandler):
+    """
+    GET  /recommend?category=...&skills=python,sql&k=5
+    POST /recommend   {"categories": [...], "skills": [...], "k": 5}
+    GET  /stats       cache statistics
+
+    Categories are searched concurrently and merged into one global top-k;
+    categories slower than the shard timeout are listed under "dropped"
+    and categories without an index under "missing".
+    Malformed requests, including k outside 1..MAX_K, get a 400 with an
+    "error" message.
+    """
+
+    cache = None
+    executor = None
+    shard_timeout = SHARD_TIMEOUT
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def respond(self, categories, skills, k):
+        start = time.perf_counter()
+        hits, dropped, missing = search_categories(
+            self.cache, categories, skills, k, executor=self.executor, timeout=self.shard_timeout,
+        )
+        self.send_json(200, {
+            'recommendations': [
+                {'category': category, 'title': title, 'score': score}
+                for score, category, _, title in hits
+            ],
+            'dropped': dropped,
+            'missing': missing,
+            'took_ms': (time.perf_counter() - start) * 1000,
+        })
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/stats':
+            self.send_json(200, self.cache.stats())
+        elif url.path == '/recommend':
+            query = parse_qs(url.query)
+            skills = [skill for value in query.get('skills', []) for skill in value.split(',')]
+            try:
+                k = parse_k(query.get('k', [DEFAULT_K])[0])
+            except ValueError as e:
+                self.send_json(400, {'error': str(e)})
+                return
+            self.respond(query.get('category', []), skills, k)
+        else:
+            self.send_json(404, {'error': f"Unknown path '{url.path}'"})
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/recommend':
+            self.send_json(404, {'error': f"Unknown path '{self.path}'"})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        except ValueError as e:
+            # Also covers a malformed Content-Length and a body that is not UTF-8
+            self.send_json(400, {'error': f"Invalid JSON: {e}"})
+            return
+        if not isinstance(request, dict):
+            self.send_json(400, {'error': "Request body must be a JSON object"})
+            return
+        try:
+            categories = parse_strings(request.get('categories', []), 'categories')
+            skills = parse_strings(request.get('skills', []), 'skills')
+            k = parse_k(request.get('k', DEFAULT_K))
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+            return
+        self.respond(categories, skills, k)
+
+    def log_message(self, format, *args):
+        # Keep the console quiet; per-request timings are in the responses
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve job recommendations from resident category indexes.")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--store-dir', default=STORE_DIR)
+    parser.add_argument('--index-dir', default=INDEX_DIR)
+    parser.add_argument('--incremental-dir', default=INCREMENTAL_INDEX_DIR,
+                        help="Incremental indexes, preferred over --index-dir for the categories they cover")
+    parser.add_argument('--memory-budget-mb', type=int, default=MEMORY_BUDGET // 1024 ** 2,
+                        help="Resident index budget; least recently used categories are evicted beyond it")
+    parser.add_argument('--fanout-workers', type=int, default=FANOUT_WORKERS,
+                        help="Threads shared by all requests for per-category searches")
+    parser.add_argument('--shard-timeout-ms', type=int, default=int(SHARD_TIMEOUT * 1000),
+                        help="Categories that take longer are dropped from the response")
+    args = parser.parse_args()
+
+    RecommendationHandler.cache = CategoryCache(
+        args.store_dir, args.index_dir, args.memory_budget_mb * 1024 ** 2, args.incremental_dir,
+    )
+    RecommendationHandler.executor = ThreadPoolExecutor(max_workers=args.fanout_workers)
+    RecommendationHandler.shard_timeout = args.shard_timeout_ms / 1000
+    server = ThreadingHTTPServer((args.host, args.port), RecommendationHandler)
+    print(f"🚀 Serving recommendations on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import os
+import argparse
+import numpy as np
+from scipy import sparse
+from skill_store import STORE_DIR, SkillStore, mmap_npz, preprocess_text
+
+# Co-occurrence neighbours, saved next to the skill store manifest
+COOCCURRENCE_FILE = 'cooccurrence.npz'
+
+# Neighbours kept per skill
+TOP_N = 50
+
+# Skill pairs listed together in fewer postings are too noisy to score
+MIN_COUNT = 5
+
+# Neighbour frequencies are raised to this power before computing PMI,
+# which keeps rare skills from dominating every neighbour list
+SMOOTHING = 0.75
+
+# Neighbours added per query skill when a query is expanded
+EXPANSION = 3
+
+# Queries with fewer skills than this are expanded by the scripts
+MIN_QUERY_SKILLS = 3
+
+
+def load_job_matrix(store):
+    """All categories of the store stacked into one binary job x skill CSR matrix over global skill ids."""
+    indptrs, indices = [np.zeros(1, dtype=np.int64)], []
+    nnz = 0
+    for category in store.categories:
+        skills = store.load_category(category)
+        indptrs.append(np.asarray(skills.matrix.indptr[1:], dtype=np.int64) + nnz)
+        indices.append(np.asarray(skills.columns)[skills.matrix.indices])
+        nnz += skills.matrix.nnz
+    indices = np.concatenate(indices) if indices else np.empty(0, dtype=np.int32)
+    indptr = np.concatenate(indptrs)
+    return sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), indices, indptr),
+        shape=(len(indptr) - 1, len(store.vocabulary)),
+    )
+
+def pmi_neighbours(jobs, top_n=TOP_N, min_count=MIN_COUNT, smoothing=SMOOTHING):
+    """
+    Top-n neighbours of every skill by positive pointwise mutual
+    information, log(P(a, b) / (P(a) P(b))), from a binary job x skill
+    matrix, with P(b) taken from frequencies raised to `smoothing`.
+    All pair counts come from a single sparse X^T X product.
+    Returns (indptr, indices, scores, counts) of a skill x skill CSR matrix
+    whose rows are sorted by descending PMI.
+    """
+    n_jobs, n_skills = jobs.shape
+    counts = (jobs.T @ jobs).tocoo()
+    skill_counts = counts.diagonal() if n_skills else np.empty(0, dtype=np.float32)
+
+    keep = (counts.row != counts.col) & (counts.data >= min_count)
+    rows, columns, pairs = counts.row[keep], counts.col[keep], counts.data[keep]
+    smoothed = skill_counts.astype(np.float64) ** smoothing
+    scores = np.log(pairs * smoothed.sum() / (skill_counts[rows] * smoothed[columns])).astype(np.float32)
+    positive = scores > 0
+    rows, columns, pairs, scores = rows[positive], columns[positive], pairs[positive], scores[positive]
+
+    # Best first within each row; ties go to the more frequent pair
+    order = np.lexsort((-pairs, -scores, rows))
+    rows, columns, scores, pairs = rows[order], columns[order], scores[order], pairs[order]
+    row_counts = np.bincount(rows, minlength=n_skills)
+    starts = np.concatenate([[0], np.cumsum(row_counts)[:-1]])
+    keep = np.arange(len(rows)) - starts[rows] < top_n
+
+    indptr = np.zeros(n_skills + 1, dtype=np.int64)
+    np.cumsum(np.minimum(row_counts, top_n), out=indptr[1:])
+    return indptr, columns[keep].astype(np.int32), scores[keep], pairs[keep].astype(np.int32)
+
+def compile_cooccurrence(store_dir=STORE_DIR, top_n=TOP_N, min_count=MIN_COUNT, smoothing=SMOOTHING):
+    """Compute the co-occurrence neighbours of a compiled skill store and save them into it."""
+    store = SkillStore(store_dir)
+    jobs = load_job_matrix(store)
+    # Repeated skills of a posting count once
+    jobs.data[:] = 1
+    indptr, indices, scores, counts = pmi_neighbours(jobs, top_n, min_count, smoothing)
+
+    # Uncompressed, so SkillCooccurrence can memory-map it
+    np.savez(os.path.join(store_dir, COOCCURRENCE_FILE), indptr=indptr, indices=indices, scores=scores, counts=counts)
+    print(f"✅ Co-occurrence neighbours saved: {len(indices)} pairs over {len(store.vocabulary)} skills "
+          f"from {jobs.shape[0]} postings")
+
+
+class SkillCooccurrence:
+    """
+    Memory-mapped co-occurrence neighbours of the skill store vocabulary.
+    Expanding a query only slices the neighbour rows of its skills.
+    """
+
+    def __init__(self, store_dir=STORE_DIR, store=None):
+        self.store = store if store is not None else SkillStore(store_dir)
+        arrays = mmap_npz(os.path.join(self.store.store_dir, COOCCURRENCE_FILE))
+        self.indptr = arrays['indptr']
+        self.indices = arrays['indices']
+        self.scores = arrays['scores']
+        self.counts = arrays['counts']
+        if len(self.indptr) != len(self.store.vocabulary) + 1:
+            raise ValueError(f"{COOCCURRENCE_FILE} does not match the skill store vocabulary; recompile it")
+
+    def neighbours(self, skill, n=TOP_N):
+        """Up to n (skill, PMI) pairs co-occurring with a skill, best first."""
+        skill_id = self.store.skill_ids.get(preprocess_text(skill))
+        if skill_id is None:
+            return []
+        start = self.indptr[skill_id]
+        end = min(self.indptr[skill_id + 1], start + n)
+        return [
+            (self.store.vocabulary[i], float(score))
+            for i, score in zip(self.indices[start:end].tolist(), self.scores[start:end].tolist())
+        ]
+
+    def expand(self, skills, n=EXPANSION):
+        """
+        The skills, as given, followed by up to n neighbours of each,
+        skipping skills already in the list. Unknown skills are kept.
+        """
+        expanded = dict.fromkeys(skills)
+        for skill in skills:
+            added = 0
+            for neighbour, _ in self.neighbours(skill):
+                if added == n:
+                    break
+                if neighbour not in expanded:
+                    expanded[neighbour] = None
+                    added += 1
+        return list(expanded)
+
+
+def expand_query(skills, store=None, min_skills=MIN_QUERY_SKILLS, n=EXPANSION):
+    """
+    Expand a list of skills with co-occurring skills if it has
+    fewer than min_skills. Without precomputed neighbours the list is
+    returned unchanged.
+    """
+    if len(skills) >= min_skills:
+        return skills
+    try:
+        cooccurrence = SkillCooccurrence(store=store)
+    except FileNotFoundError:
+        print(f"⚠️ No {COOCCURRENCE_FILE} found; run skill_cooccurrence.py to expand short queries.")
+        return skills
+    return cooccurrence.expand(skills, n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute skill co-occurrence neighbours of the skill store.")
+    parser.add_argument('--store', default=STORE_DIR, help="Compiled skill store directory")
+    parser.add_argument('--top-n', type=int, default=TOP_N, help="Neighbours kept per skill")
+    parser.add_argument('--min-count', type=int, default=MIN_COUNT, help="Postings a pair needs to be scored")
+    parser.add_argument('--smoothing', type=float, default=SMOOTHING, help="Power applied to neighbour frequencies")
+    parser.add_argument('--show', nargs='*', default=[], help="Skills whose neighbours to print afterwards")
+    args = parser.parse_args()
+
+    compile_cooccurrence(args.store, args.top_n, args.min_count, args.smoothing)
+    cooccurrence = SkillCooccurrence(args.store)
+    for skill in args.show:
+        print(f"{skill}: {cooccurrence.neighbours(skill, 10)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+import os
+import re
+import json
+import struct
+import zipfile
+import unicodedata
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from subset_loader import CSV_DIR, PARQUET_DIR, category_key, list_categories, load_category
+
+# Directory for the compiled skill store
+STORE_DIR = './skill_store'
+
+MANIFEST_FILE = 'manifest.json'
+VOCABULARY_FILE = 'vocabulary.json'
+STORE_VERSION = 1
+
+# Header-less subset CSV columns used by the pipeline
+TITLE_COLUMN = 0
+SKILLS_COLUMN = 10
+
+
+# --- Preprocessing Functions ---
+def preprocess_text(text):
+    """
+    Normalize Unicode, convert to lowercase, remove punctuation,
+    and remove extra whitespace.
+    """
+    if not isinstance(text, str):
+        return ''
+    text = unicodedata.normalize('NFKD', text)
+    text = text.lower()
+    text = re.sub(r'[^\w\s]', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+def split_skills(text):
+    """
+    Split a comma-separated skills cell and preprocess each skill.
+    Empty skills are dropped.
+    """
+    if not isinstance(text, str):
+        return []
+    skills = (preprocess_text(skill) for skill in text.split(','))
+    return [skill for skill in skills if skill]
+
+def preprocess_unique(texts):
+    """
+    preprocess_text over an array of distinct strings, with pandas string
+    methods. Object dtype keeps Python's regex semantics, which
+    Arrow-backed strings would not.
+    """
+    return (
+        pd.Series(texts, dtype=object)
+        .str.normalize('NFKD')
+        .str.lower()
+        .str.replace(r'[^\w\s]', '', regex=True)
+        .str.replace(r'\s+', ' ', regex=True)
+        .str.strip()
+        .to_numpy(dtype=object)
+    )
+
+def preprocess_series(texts):
+    """
+    preprocess_text over a pandas Series.
+    Each distinct value is processed once and mapped back through its
+    factorized code; missing and non-string values become ''.
+    """
+    texts = pd.Series(texts, dtype=object)
+    codes, uniques = pd.factorize(texts)
+    uniques = np.asarray(uniques, dtype=object)
+    is_text = np.fromiter((isinstance(text, str) for text in uniques), dtype=bool, count=len(uniques))
+
+    # The extra last entry serves code -1 (missing values)
+    processed = np.full(len(uniques) + 1, '', dtype=object)
+    processed[:-1][is_text] = preprocess_unique(uniques[is_text])
+    return pd.Series(processed[codes], index=texts.index, dtype=object)
+
+def split_skills_column(texts):
+    """
+    split_skills over a whole pandas Series.
+    All cells are split with a single join and split, each distinct raw
+    skill is preprocessed once, and empty and repeated skills of a row are
+    dropped, keeping first occurrences.
+    Returns (rows, ids, skills): the row position and skill id of every
+    kept skill in row order, and the skills in first-seen order.
+    """
+    texts = pd.Series(texts, dtype=object)
+    texts = texts.where(texts.map(lambda text: isinstance(text, str)), '')
+    counts = np.fromiter((text.count(',') + 1 for text in texts), dtype=np.int64, count=len(texts))
+    rows = np.repeat(np.arange(len(texts), dtype=np.int64), counts)
+
+    raw_codes, raw_skills = pd.factorize(pd.Series(','.join(texts).split(','), dtype=object))
+    processed = preprocess_unique(raw_skills)
+    # Skills that preprocess to '' get code -1 and are dropped
+    processed = np.where(processed == '', None, processed)
+    codes, skills = pd.factorize(pd.Series(processed, dtype=object))
+    ids = codes[raw_codes]
+
+    keep = ids >= 0
+    rows, ids = rows[keep], ids[keep]
+    first = ~pd.Series(rows * max(len(skills), 1) + ids).duplicated().to_numpy()
+    return rows[first], ids[first].astype(np.int32), np.asarray(skills, dtype=object)
+
+
+# --- Compile Step ---
+def read_category(category, csv_dir=CSV_DIR, parquet_dir=PARQUET_DIR):
+    """Read the title and skills columns of one category."""
+    df = load_category(category, [TITLE_COLUMN, SKILLS_COLUMN], csv_dir, parquet_dir)
+    missing = {TITLE_COLUMN, SKILLS_COLUMN} - set(df.columns)
+    if missing:
+        raise KeyError(f"Columns {sorted(missing)} not found in {category}")
+    return df
+
+def write_category(path, titles, indptr, ids):
+    """
+    Save one category as an uncompressed .npz so it can be memory-mapped.
+    Columns are local to the category; `columns` maps them to global skill ids.
+    """
+    columns = np.unique(ids).astype(np.int32)
+    local = np.searchsorted(columns, ids).astype(np.int32)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(local), dtype=np.float32), local, indptr),
+        shape=(len(indptr) - 1, len(columns)),
+    )
+    matrix.sort_indices()
+
+    # int32 offsets let scipy use the mapped arrays without up/down-casting
+    index_dtype = np.int32 if matrix.nnz < np.iinfo(np.int32).max else np.int64
+    np.savez(
+        path,
+        indptr=matrix.indptr.astype(index_dtype),
+        indices=matrix.indices.astype(np.int32),
+        columns=columns,
+        titles=titles,
+    )
+    return matrix.nnz, len(columns)
+
+def compile_store(csv_dir=CSV_DIR, parquet_dir=PARQUET_DIR, store_dir=STORE_DIR):
+    """
+    Compile every subset into one global skill vocabulary plus a
+    per-category CSR job x skill matrix, described by a JSON manifest.
+    """
+    category_names = list_categories(csv_dir)
+    if not category_names:
+        print("❌ No CSV files found in the directory.")
+        return
+
+    os.makedirs(store_dir, exist_ok=True)
+
+    frames = {}
+    for category_name in category_names:
+        try:
+            frames[category_name] = read_category(category_name, csv_dir, parquet_dir)
+        except Exception as e:
+            print(f"❌ Error reading {category_name}: {e}")
+    if not frames:
+        print("❌ No categories could be read.")
+        return
+
+    # All categories are preprocessed in one vectorized pass, so skills
+    # shared between categories are normalized once. Skill ids come out in
+    # first-seen order and are re-numbered in sorted order.
+    rows, ids, skills = split_skills_column(pd.concat([df[SKILLS_COLUMN] for df in frames.values()], ignore_index=True))
+    vocabulary = sorted(skills)
+    remap = np.empty(len(skills), dtype=np.int32)
+    remap[sorted(range(len(skills)), key=skills.__getitem__)] = np.arange(len(skills), dtype=np.int32)
+    ids = remap[ids]
+    print(f"✅ Global vocabulary size: {len(vocabulary)}")
+
+    n_rows = sum(len(df) for df in frames.values())
+    offsets = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=offsets[1:])
+
+    categories = {}
+    start = 0
+    for category_name, df in frames.items():
+        end = start + len(df)
+        indptr = offsets[start:end + 1] - offsets[start]
+        titles = df[TITLE_COLUMN].fillna('').astype(str).to_numpy(dtype=str)
+        filename = f"{category_name}.npz"
+        nnz, n_skills = write_category(
+            os.path.join(store_dir, filename), titles, indptr, ids[offsets[start]:offsets[end]],
+        )
+        start = end
+        categories[category_name] = {
+            'file': filename,
+            'rows': len(titles),
+            'skills': n_skills,
+            'nnz': nnz,
+        }
+
+    with open(os.path.join(store_dir, VOCABULARY_FILE), 'w', encoding='utf-8') as file:
+        json.dump(vocabulary, file, ensure_ascii=False)
+
+    manifest = {
+        'version': STORE_VERSION,
+        'vocabulary': VOCABULARY_FILE,
+        'vocabulary_size': len(vocabulary),
+        'categories': categories,
+    }
+    with open(os.path.join(store_dir, MANIFEST_FILE), 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=4, ensure_ascii=False)
+
+    print(f"✅ Skill store saved: {len(categories)} categories in '{store_dir}'")
+
+
+# --- Loaders ---
+def mmap_npz(path):
+    """
+    Memory-map every array of an uncompressed .npz file.
+    Each member is a .npy file stored as-is inside the zip, so its data can be
+    mapped straight from the archive without reading it.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as file:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path} is compressed and cannot be memory-mapped")
+
+            # Skip the zip local file header to reach the .npy member
+            file.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack('<HH', file.read(4))
+            file.seek(info.header_offset + 30 + name_length + extra_length)
+
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+
+            name = info.filename[:-len('.npy')]
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(
+                    path, dtype=dtype, mode='r', offset=file.tell(), shape=shape,
+                    order='F' if fortran_order else 'C',
+                )
+    return arrays
+
+
+class CategorySkills:
+    """
+    Job x skill matrix of one category.
+    Matrix columns are local to the category; `columns[j]` is the global
+    skill id of local column j.
+    """
+
+    def __init__(self, name, indptr, indices, columns, titles, skill_ids):
+        self.name = name
+        self.columns = columns
+        self.titles = titles
+        self.skill_ids = skill_ids
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, indptr),
+            shape=(len(indptr) - 1, len(columns)),
+        )
+
+    @property
+    def dimension(self):
+        return len(self.columns)
+
+    def local_columns(self, ids):
+        """
+        Map global skill ids to local columns.
+        Returns (found, positions): which ids occur in this category and
+        their local columns.
+        """
+        ids = np.asarray(ids, dtype=np.int32)
+        positions = np.minimum(np.searchsorted(self.columns, ids), max(self.dimension - 1, 0))
+        found = self.columns[positions] == ids if self.dimension else np.zeros(len(ids), dtype=bool)
+        return found, positions[found]
+
+    def transform(self, skill_lists):
+        """Binarize lists of preprocessed skills into a dense float32 matrix over the local columns."""
+        rows = []
+        ids = []
+        for row, skills in enumerate(skill_lists):
+            for skill in skills:
+                if skill in self.skill_ids:
+                    rows.append(row)
+                    ids.append(self.skill_ids[skill])
+
+        vectors = np.zeros((len(skill_lists), self.dimension), dtype=np.float32)
+        found, positions = self.local_columns(ids)
+        vectors[np.asarray(rows, dtype=np.int64)[found], positions] = 1
+        return vectors
+
+
+class SkillStore:
+    """Read access to a compiled skill store."""
+
+    def __init__(self, store_dir=STORE_DIR):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, MANIFEST_FILE), 'r', encoding='utf-8') as file:
+            self.manifest = json.load(file)
+        with open(os.path.join(store_dir, self.manifest['vocabulary']), 'r', encoding='utf-8') as file:
+            self.vocabulary = json.load(file)
+        self.skill_ids = {skill: i for i, skill in enumerate(self.vocabulary)}
+
+    @property
+    def categories(self):
+        return list(self.manifest['categories'])
+
+    def __contains__(self, category):
+        return category_key(category) in self.manifest['categories']
+
+    def load_category(self, category):
+        """Memory-map the matrix of a category, given its display or file-safe name."""
+        name = category_key(category)
+        entry = self.manifest['categories'][name]
+        arrays = mmap_npz(os.path.join(self.store_dir, entry['file']))
+        return CategorySkills(
+            name, arrays['indptr'], arrays['indices'], arrays['columns'], arrays['titles'], self.skill_ids,
+        )
+
+
+def main():
+    """Compile the subset CSVs into the skill store."""
+    compile_store()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import os
+import re
+import pandas as pd
+
+# Directories for the header-less subset CSVs and their columnar copies
+CSV_DIR = './subsets'
+PARQUET_DIR = './subsets_parquet'
+
+
+def category_key(category):
+    """Return the file-safe name used for a category in subsets and the store."""
+    return re.sub(r'[<>:"/\\|?*]', '_', category)
+
+def list_categories(csv_dir=CSV_DIR):
+    """List the file-safe names of all categories in the subsets directory."""
+    return sorted(f.replace('_subset.csv', '') for f in os.listdir(csv_dir) if f.endswith('_subset.csv'))
+
+
+# --- Conversion ---
+def convert_category(category, csv_dir=CSV_DIR, parquet_dir=PARQUET_DIR):
+    """
+    Write one subset CSV as a Parquet file.
+    Every column is kept as a nullable string so all category files share
+    one schema; column names are the CSV column positions.
+    """
+    name = category_key(category)
+    df = pd.read_csv(os.path.join(csv_dir, f"{name}_subset.csv"), header=None, dtype=str)
+    df.columns = [str(column) for column in df.columns]
+    df.to_parquet(os.path.join(parquet_dir, f"{name}.parquet"), index=False)
+    return len(df)
+
+def convert_subsets(csv_dir=CSV_DIR, parquet_dir=PARQUET_DIR):
+    """Convert the subsets directory into one Parquet file per category."""
+    categories = list_categories(csv_dir)
+    if not categories:
+        print("❌ No CSV files found in the directory.")
+        return
+
+    os.makedirs(parquet_dir, exist_ok=True)
+
+    total_rows = 0
+    for category in categories:
+        try:
+            total_rows += convert_category(category, csv_dir, parquet_dir)
+        except Exception as e:
+            print(f"❌ Error converting {category}: {e}")
+
+    print(f"✅ Converted {len(categories)} categories ({total_rows} rows) to '{parquet_dir}'")
+
+
+# --- Projected Reads ---
+def load_category(category, columns=None, csv_dir=CSV_DIR, parquet_dir=PARQUET_DIR):
+    """
+    Load the requested columns of one category.
+    Reads the Parquet copy when it exists and falls back to parsing only the
+    requested CSV columns otherwise. Columns are returned as strings, keyed by
+    their integer position like pd.read_csv(header=None).
+    """
+    path = source_path(category, csv_dir, parquet_dir)
+    if path is None:
+        raise FileNotFoundError(f"No subset found for category '{category}'")
+
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path, columns=[str(column) for column in columns] if columns is not None else None)
+        df.columns = [int(column) for column in df.columns]
+        return df
+
+    return pd.read_csv(path, header=None, usecols=columns, dtype=str)
+
+def source_path(category, csv_dir=CSV_DIR, parquet_dir=PARQUET_DIR):
+    """Return the file load_category reads for a category, or None if there is none."""
+    name = category_key(category)
+    for path in (os.path.join(parquet_dir, f"{name}.parquet"), os.path.join(csv_dir, f"{name}_subset.csv")):
+        if os.path.exists(path):
+            return path
+    return None
+
+def category_exists(category, csv_dir=CSV_DIR, parquet_dir=PARQUET_DIR):
+    return source_path(category, csv_dir, parquet_dir) is not None
+
+def load_subsets(categories, columns=None, csv_dir=CSV_DIR, parquet_dir=PARQUET_DIR):
+    """
+    Load the requested columns of several categories into one DataFrame.
+    Missing categories are skipped with a warning.
+    """
+    dataframes = []
+    for category in categories:
+        if not category_exists(category, csv_dir, parquet_dir):
+            print(f"Warning: Category '{category}' not found in subsets. Skipping this category.")
+            continue
+        dataframes.append(load_category(category, columns, csv_dir, parquet_dir))
+
+    if not dataframes:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(dataframes, ignore_index=True)
+
+
+def main():
+    """Convert the subset CSVs to Parquet."""
+    convert_subsets()
+
+if __name__ == "__main__":
+    main()
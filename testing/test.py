@@ -1,11 +1,8 @@
-import pandas as pd
-import numpy as np
-import os
-import re
-import faiss  # FAISS library for similarity search
 from sklearn.preprocessing import MultiLabelBinarizer
-from collections import Counter
-from preprocessing import normalize_skills_batch  # Ensure this module is available
+from binary_skills import BinarySkillIndex, pack_rows
+from preprocessing import normalize_skill_column, normalize_skills_batch  # Ensure this module is available
+from skill_cooccurrence import expand_query
+from subset_loader import load_subsets
 
 def main():
     # User preference categories (replace with actual user inputs)
@@ -13,32 +10,14 @@ def main():
 
     # User's query skills (replace with actual user input)
     user_skills = ['java', 'machine learning', 'python', 'sql', 'analytics']  # This should come from user input
+    # One or two coarse skills are widened with precomputed co-occurring skills
+    user_skills = expand_query(user_skills)
     user_skills = normalize_skills_batch(user_skills)
 
-    # Function to create a safe filename from the category name
-    def get_category_filename(category):
-        safe_category = re.sub(r'[<>:"/\\|?*]', '_', category)
-        filename = f"{safe_category}_subset.csv"
-        filepath = os.path.join('subsets', filename)
-        return filepath
-
-    # List to hold DataFrames from each category
-    dataframes = []
-
-    # Check for each category's CSV file and load it
-    for category in categories:
-        filepath = get_category_filename(category)
-        if os.path.isfile(filepath):
-            df = pd.read_csv(filepath, header=None)
-            dataframes.append(df)
-            print(f"Loaded data for category '{category}' from '{filepath}'")
-        else:
-            print(f"Warning: Category '{category}' not found in subsets. Skipping this category.")
-
-    # If there is data to process, combine it into one DataFrame
-    if dataframes:
-        combined_df = pd.concat(dataframes, ignore_index=True)
-    else:
+    # Load only the title and skills columns of the requested categories
+    combined_df = load_subsets(categories, columns=[0, 10])
+
+    if combined_df.empty:
         print("No data to process. Exiting.")
         return
 
@@ -48,11 +27,9 @@ def main():
     # Fill NaN values in column 10 with empty strings (assuming this column contains skills)
     combined_df[10] = combined_df[10].fillna('')
 
-    # Convert skills in column 10 from comma-separated strings to lists and strip whitespace
-    combined_df[10] = combined_df[10].apply(lambda x: [skill.strip().lower() for skill in x.split(',')] if isinstance(x, str) else x)
-
-    # Normalize skills in each row
-    combined_df[10] = combined_df[10].apply(lambda skills: normalize_skills_batch(skills))
+    # Split the comma-separated skills in column 10, strip and lowercase them and
+    # normalize all rows; each distinct skill is processed once
+    combined_df[10] = normalize_skill_column(combined_df[10])
 
     # Flatten all skills into a single list to create the binarizer's classes
     all_skills = [skill for sublist in combined_df[10] for skill in sublist]
@@ -67,48 +44,20 @@ def main():
     # Transform the job postings' skills into binary vectors
     skill_vectors = mlb.transform(combined_df[10])
 
-    # **Padding to make num_bits a multiple of 8**
-    num_bits_original = skill_vectors.shape[1]
-    num_bits_padded = ((num_bits_original + 7) // 8) * 8  # Next multiple of 8
-    padding_required = num_bits_padded - num_bits_original
-
-    if padding_required > 0:
-        # Pad skill_vectors with zeros
-        skill_vectors = np.hstack([skill_vectors, np.zeros((skill_vectors.shape[0], padding_required), dtype=np.uint8)])
-
-    num_bits = skill_vectors.shape[1]  # Updated number of bits after padding
-
-    # Convert skill_vectors to bytes for FAISS binary index
-    skill_vectors_bin = np.packbits(skill_vectors, axis=1)
-
-    # Initialize FAISS binary HNSW index for binary vectors
-    index = faiss.IndexBinaryHNSW(num_bits, 32)
-
-    # Optionally set efConstruction and efSearch parameters
-    index.hnsw.efConstruction = 40
-    index.hnsw.efSearch = 16
-
-    # Add the binary skill vectors to the FAISS index
-    index.add(skill_vectors_bin)
+    # Pack the binary vectors into 64-bit words; no padding to a multiple of 8 is needed
+    index = BinarySkillIndex.from_matrix(skill_vectors)
 
     # Transform the user's skills into a binary vector using the same binarizer
     query_skill_vector = mlb.transform([user_skills])
 
-    # **Pad the query vector to match num_bits**
-    if padding_required > 0:
-        query_skill_vector = np.hstack([query_skill_vector, np.zeros((query_skill_vector.shape[0], padding_required), dtype=np.uint8)])
-
     # Check if the query vector is all zeros
     if query_skill_vector.sum() == 0:
         print("Warning: None of the user's skills match the skills in the dataset.")
         return
 
-    # Convert the query vector to bytes
-    query_skill_vector_bin = np.packbits(query_skill_vector, axis=1)
-
-    # Perform search to get top k recommendations
+    # Exact popcount search for the top k recommendations
     k = 5  # Number of recommendations
-    distances, indices = index.search(query_skill_vector_bin, k)
+    distances, indices = index.search(pack_rows(query_skill_vector, index.n_bits), k, metric='hamming')
 
     # Retrieve recommended job postings based on indices
     recommended_jobs = combined_df.iloc[indices[0]].reset_index(drop=True)
@@ -118,9 +67,9 @@ def main():
     for i in range(len(recommended_jobs)):
         job = recommended_jobs.iloc[i]
         distance = distances[0][i]
-        print(f"- {job[0]} (Hamming Distance: {distance})")  # Distance is the Hamming distance
+        print(f"- {job[0]} (Hamming Distance: {distance:.0f})")  # Distance is the Hamming distance
 
     print('\nRecommendation process completed.')
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
\ No newline at end of file